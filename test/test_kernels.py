@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""数值计算内核测试：JIT 与 NumPy 两种实现都须与 pandas 参考结果一致"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from widgets.dynamic_trend_widget import kernels as trend_kernels
+from widgets.dynamic_static_widget import kernels as static_kernels
+
+
+def _variants(module):
+    """两种实现：numba 未安装时跳过 JIT 版本"""
+    return [
+        pytest.param((module, True), id='jit',
+                     marks=pytest.mark.skipif(not module.NUMBA_AVAILABLE, reason='numba 未安装')),
+        pytest.param((module, False), id='numpy'),
+    ]
+
+
+def _use_variant(request, monkeypatch):
+    """按参数切换内核模块的实现，返回内核模块"""
+    module, use_jit = request.param
+    monkeypatch.setattr(module, 'NUMBA_AVAILABLE', use_jit)
+    return module
+
+
+@pytest.fixture(params=_variants(trend_kernels))
+def trend(request, monkeypatch):
+    """趋势组件内核（JIT / NumPy）"""
+    return _use_variant(request, monkeypatch)
+
+
+@pytest.fixture(params=_variants(static_kernels))
+def static(request, monkeypatch):
+    """统计组件内核（JIT / NumPy）"""
+    return _use_variant(request, monkeypatch)
+
+
+def _random_values(n: int, k: int, nan_ratio: float, seed: int = 0) -> np.ndarray:
+    """带缺失值和较大偏移量的随机数据"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(loc=1e6, scale=10.0, size=(n, k))
+    values[rng.random((n, k)) < nan_ratio] = np.nan
+    return values
+
+
+# ---------------------------------------------------------------- 滑动平均
+
+@pytest.mark.parametrize('n, window', [(1, 1), (1, 5), (7, 3), (50, 4), (50, 5), (50, 49), (10, 25), (500, 31)])
+@pytest.mark.parametrize('nan_ratio', [0.0, 0.3])
+def test_moving_average_matches_rolling(trend, n, window, nan_ratio):
+    values = _random_values(n, 3, nan_ratio)
+    # 一列全部缺失
+    values[:, 2] = np.nan
+
+    result = trend.moving_average(values, window)
+
+    expected = pd.DataFrame(values).rolling(window=window, center=True, min_periods=1).mean().to_numpy()
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_moving_average_one_and_two_dimensional_agree(trend, order):
+    values = np.asarray(_random_values(200, 2, 0.1), order=order)
+
+    both = trend.moving_average(values, 9)
+
+    for c in range(values.shape[1]):
+        single = trend.moving_average(np.ascontiguousarray(values[:, c]), 9)
+        expected = pd.Series(values[:, c]).rolling(window=9, center=True, min_periods=1).mean().to_numpy()
+        np.testing.assert_allclose(single, expected, rtol=1e-12, atol=1e-6, equal_nan=True)
+        np.testing.assert_allclose(both[:, c], single, rtol=1e-12, atol=1e-6, equal_nan=True)
+
+
+# ---------------------------------------------------------------- 分段平均
+
+def _bin_reference(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """pandas 参考：按段号分组求平均（忽略 NaN，全缺失的段为 NaN）"""
+    labels = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+    return pd.DataFrame(values).groupby(labels).mean().to_numpy()
+
+
+@pytest.mark.parametrize('n, step, skip', [(1, 1, 0), (10, 3, 0), (10, 3, 2), (100, 7, 0), (100, 10, 4), (5, 60, 0)])
+@pytest.mark.parametrize('nan_ratio', [0.0, 0.4])
+def test_bin_means_matches_groupby(trend, n, step, skip, nan_ratio):
+    values = np.asfortranarray(_random_values(n, 3, nan_ratio, seed=1))
+    values[: min(step, n), 1] = np.nan
+    # 首段缺少 skip 个点，其后每 step 个点一段，末段可以不满
+    starts = np.arange(step - skip if skip else 0, n, step)
+    if skip:
+        starts = np.concatenate(([0], starts))
+    starts = starts.astype(np.int64)
+
+    result = trend.bin_means(values, starts)
+
+    np.testing.assert_allclose(result, _bin_reference(values, starts), rtol=1e-12, equal_nan=True)
+
+
+def test_bin_means_matches_resample(trend):
+    index = pd.date_range('2024-01-01 00:00:20', periods=200, freq='10s')
+    values = _random_values(len(index), 2, 0.2, seed=2)
+    df = pd.DataFrame(values, index=index)
+    # 1 分钟的箱从整分起算：首箱只有 4 个点
+    starts = np.concatenate(([0], np.arange(4, len(index), 6))).astype(np.int64)
+
+    result = trend.bin_means(np.asfortranarray(values), starts)
+
+    np.testing.assert_allclose(result, df.resample('1min').mean().to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+# ---------------------------------------------------------------- LTTB 降采样
+
+def _lttb_reference(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """逐点实现的 LTTB，作为参考"""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    indices = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        if avg_end > avg_start:
+            avg_x = x[avg_start:avg_end].mean()
+            avg_y = y[avg_start:avg_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+                 for j in range(range_start, range_end)]
+        a = range_start + int(np.argmax(areas)) if areas else range_start
+        indices.append(a)
+    indices.append(n - 1)
+    return np.array(indices, dtype=np.int64)
+
+
+@pytest.mark.parametrize('n, n_out', [(10, 3), (100, 10), (1000, 97), (5000, 600), (301, 300)])
+def test_downsample_indices_matches_reference(trend, n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.random(n)) * 1e3
+    y = rng.normal(size=n).cumsum()
+
+    result = trend.downsample_indices(x, y, n_out)
+
+    np.testing.assert_array_equal(result, _lttb_reference(x, y, n_out))
+    assert len(result) == n_out
+    assert result[0] == 0 and result[-1] == n - 1
+    assert np.all(np.diff(result) > 0)
+
+
+def test_downsample_indices_datetime_axis(trend):
+    x = pd.date_range('2024-01-01', periods=2000, freq='s').to_numpy()
+    y = np.sin(np.arange(2000) / 50.0)
+
+    result = trend.downsample_indices(x, y, 100)
+
+    np.testing.assert_array_equal(result, _lttb_reference(x.view(np.int64).astype(np.float64), y, 100))
+
+
+@pytest.mark.parametrize('n, n_out', [(0, 10), (5, 10), (10, 10), (100, 2)])
+def test_downsample_indices_keeps_all_points_when_not_needed(trend, n, n_out):
+    x = np.arange(n, dtype=np.float64)
+
+    result = trend.downsample_indices(x, x, n_out)
+
+    np.testing.assert_array_equal(result, np.arange(n))
+
+
+# ---------------------------------------------------------------- 箱线图与异常值
+
+def _static_samples():
+    rng = np.random.default_rng(5)
+    heavy = rng.standard_t(2, size=1000)
+    return {
+        'single': np.array([3.0]),
+        'pair': np.array([1.0, 2.0]),
+        'constant': np.full(50, 7.0),
+        'ties': np.repeat(np.arange(5, dtype=np.float64), 20),
+        'heavy_tail': heavy,
+        'outliers': np.concatenate([rng.normal(size=500), [40.0, -35.0, 60.0]]),
+    }
+
+
+STATIC_SAMPLES = _static_samples()
+
+
+@pytest.mark.parametrize('name', list(STATIC_SAMPLES))
+@pytest.mark.parametrize('multiplier', [1.5, 3.0])
+def test_boxplot_stats_matches_pandas(static, name, multiplier):
+    values = STATIC_SAMPLES[name]
+    series = pd.Series(values)
+
+    q1, median, q3, whisker_low, whisker_high, outlier_mask = static.boxplot_stats(values, multiplier)
+
+    eq1, emedian, eq3 = series.quantile([0.25, 0.5, 0.75])
+    lower_bound = eq1 - multiplier * (eq3 - eq1)
+    upper_bound = eq3 + multiplier * (eq3 - eq1)
+    expected_low = series[series >= lower_bound].min()
+    expected_high = series[series <= upper_bound].max()
+    assert (q1, median, q3) == pytest.approx((eq1, emedian, eq3))
+    assert whisker_low == expected_low
+    assert whisker_high == expected_high
+    np.testing.assert_array_equal(outlier_mask, ((series < expected_low) | (series > expected_high)).to_numpy())
+
+
+@pytest.mark.parametrize('name', list(STATIC_SAMPLES))
+@pytest.mark.parametrize('multiplier', [1.5, 3.0])
+def test_iqr_outlier_mask_matches_pandas(static, name, multiplier):
+    values = STATIC_SAMPLES[name]
+    series = pd.Series(values)
+
+    result = static.iqr_outlier_mask(values, multiplier)
+
+    q1, q3 = series.quantile([0.25, 0.75])
+    expected = (series < q1 - multiplier * (q3 - q1)) | (series > q3 + multiplier * (q3 - q1))
+    np.testing.assert_array_equal(result, expected.to_numpy())
+
+
+@pytest.mark.parametrize('name', list(STATIC_SAMPLES))
+@pytest.mark.parametrize('threshold', [2.0, 3.0])
+def test_zscore_outlier_mask_matches_pandas(static, name, threshold):
+    values = STATIC_SAMPLES[name]
+    series = pd.Series(values)
+
+    result = static.zscore_outlier_mask(values, threshold)
+
+    std_val = series.std()
+    if len(series) < 2 or std_val == 0:
+        expected = np.zeros(len(series), dtype=bool)
+    else:
+        expected = (((series - series.mean()) / std_val).abs() > threshold).to_numpy()
+    np.testing.assert_array_equal(result, expected)
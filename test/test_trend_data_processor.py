@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""动态趋势组件数据处理（重采样 + 平滑）的回归测试"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from widgets.dynamic_trend_widget.data_processor import DataProcessor
+
+
+def _gapped_frame() -> pd.DataFrame:
+    """两段相隔数年的秒级数据，按小时重采样时中间有大量空箱"""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2020-01-01', periods=100, freq='s').append(
+        pd.date_range('2024-01-01', periods=100, freq='s'))
+    return pd.DataFrame({'value': rng.normal(size=200)}, index=index)
+
+
+def _reference(df: pd.DataFrame, rule: str, window: int = None) -> pd.DataFrame:
+    """pandas 参考结果：resample 保留空箱，再按行位置居中滚动平均"""
+    result = df.resample(rule).mean()
+    if window is not None:
+        result = result.rolling(window=window, center=True, min_periods=1).mean()
+    return result
+
+
+def test_gapped_resample_with_smoothing_keeps_segments_apart():
+    df = _gapped_frame()
+    processor = DataProcessor(df, is_timeseries=True)
+    series = [{'col': 'value', 'smooth_enabled': True, 'smooth_window': 5}]
+
+    result = processor.apply_data_processing(df, series, resample_rule='1h')
+
+    expected = _reference(df, '1h', window=5)
+    pd.testing.assert_frame_equal(result.dropna(), expected.dropna(), check_freq=False)
+    # 两段各自的平均值不应被平滑到一起
+    assert result['value'].dropna().nunique() == 2
+
+
+def test_gapped_resample_without_smoothing_drops_empty_bins():
+    df = _gapped_frame()
+    processor = DataProcessor(df, is_timeseries=True)
+    series = [{'col': 'value', 'smooth_enabled': False}]
+
+    result = processor.apply_data_processing(df, series, resample_rule='1h')
+
+    expected = _reference(df, '1h').dropna()
+    assert len(result) == len(expected)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False)
+
+
+@pytest.mark.parametrize('smooth_enabled', [False, True])
+def test_resample_cache_separates_sparse_and_dense_results(smooth_enabled):
+    df = _gapped_frame()
+    processor = DataProcessor(df, is_timeseries=True)
+    # 先缓存另一种模式的结果，再确认切换平滑开关后不会取到它
+    processor.apply_data_processing(
+        df, [{'col': 'value', 'smooth_enabled': not smooth_enabled, 'smooth_window': 5}], resample_rule='1h')
+
+    result = processor.apply_data_processing(
+        df, [{'col': 'value', 'smooth_enabled': smooth_enabled, 'smooth_window': 5}], resample_rule='1h')
+
+    expected = _reference(df, '1h', window=5 if smooth_enabled else None)
+    pd.testing.assert_frame_equal(result.dropna(), expected.dropna(), check_freq=False, check_names=False)
@@ -10,8 +10,9 @@ from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import math
 
-from .constants import DEFAULT_FIGSIZE, STATISTICS_LABELS, DEFAULT_COLORS
-from .utils import format_statistic_value, get_default_color
+from .constants import DEFAULT_FIGSIZE, STATISTICS_LABELS, DEFAULT_COLORS, WEBGL_POINT_THRESHOLD, \
+    BOXPLOT_PRECOMPUTE_THRESHOLD
+from .utils import format_statistics_df, get_default_color
 
 
 def hex_to_rgba(hex_color: str, alpha: float = 0.1) -> str:
@@ -68,6 +69,16 @@ class StatisticsChartRenderer:
             pass
 
         # 设置基础布局
+        self._apply_base_layout(fig)
+
+        # 添加响应式CSS类
+        try:
+            fig.add_class('plotly-responsive')
+        except:
+            pass
+
+    def _apply_base_layout(self, fig: go.Figure):
+        """应用按 figsize 计算的基础布局"""
         fig.update_layout(
             autosize=False,
             width=int(self.figsize[0] * 72) - 10,
@@ -75,15 +86,32 @@ class StatisticsChartRenderer:
             margin=dict(l=50, r=50, t=50, b=50),
         )
 
-        # 添加响应式CSS类
-        try:
-            fig.add_class('plotly-responsive')
-        except:
-            pass
+    def _get_figure_widget(self) -> go.FigureWidget:
+        """获取复用的 FigureWidget（首次调用时创建）"""
+        if self.fig is None:
+            self.fig = self.create_figure_widget()
+        return self.fig
+
+    def _show_figure(self, fig: go.Figure, fig_container: widgets.Box) -> go.FigureWidget:
+        """
+        将构建好的 Figure 同步到复用的 FigureWidget 并放入容器。
+        在 batch_update 中整体替换 traces 与 layout，前端只收到一次更新，
+        且不会因为新建 FigureWidget 而重建画布。
+        """
+        widget = self._get_figure_widget()
+        with widget.batch_update():
+            widget.data = ()
+            widget.layout = fig.layout
+            widget.layout.autosize = False
+            widget.add_traces(fig.data)
+        if tuple(fig_container.children) != (widget,):
+            fig_container.children = [widget]
+        return widget
 
     def _create_empty_figure(self, fig_container: widgets.Box, message: str = "没有数据可显示") -> go.FigureWidget:
         """创建一个带居中提示文本的空图并放入容器，返回 FigureWidget"""
-        fig = self.create_figure_widget()
+        fig = go.Figure()
+        self._apply_base_layout(fig)
         fig.add_annotation(
             text=message,
             xref="paper", yref="paper",
@@ -91,25 +119,16 @@ class StatisticsChartRenderer:
             showarrow=False,
             font=dict(size=14, color="gray")
         )
-        fig_container.children = [fig]
-        return fig
+        return self._show_figure(fig, fig_container)
 
     def _build_summary_table_trace(self, stats_df: pd.DataFrame) -> Tuple[go.Table, List[str]]:
         """根据 stats_df 构建并返回 Plotly Table trace 与行标签（指标顺序）"""
         row_labels = list(STATISTICS_LABELS.keys())
 
-        # 每列按 row_labels 的顺序抓取并格式化
-        col_values = []
-        col_values.append(row_labels)
-        for col in stats_df.columns:
-            col_list = []
-            for r in row_labels:
-                try:
-                    val = stats_df.at[r, col]
-                except Exception:
-                    val = stats_df.loc[r, col] if (r in stats_df.index and col in stats_df.columns) else None
-                col_list.append(format_statistic_value(val))
-            col_values.append(col_list)
+        # 按 row_labels 的顺序整表格式化一次，再按列取出
+        formatted_df = format_statistics_df(stats_df.reindex(row_labels))
+        col_values = [row_labels]
+        col_values.extend(formatted_df[col].tolist() for col in formatted_df.columns)
 
         # 行背景与对齐
         n_rows = len(row_labels)
@@ -207,7 +226,8 @@ class StatisticsChartRenderer:
         if stats_df.empty:
             return self._create_empty_figure(fig_container)
 
-        fig = self.create_figure_widget()
+        fig = go.Figure()
+        self._apply_base_layout(fig)
 
         table_trace, row_labels = self._build_summary_table_trace(stats_df)
         fig.add_trace(table_trace)
@@ -248,8 +268,7 @@ class StatisticsChartRenderer:
         )
 
         # 将 FigureWidget 放入外层容器，容器布局负责显示滚动条（fig_container 在 UI 中已设置 overflow_x='auto'）
-        fig_container.children = [fig]
-        return fig
+        return self._show_figure(fig, fig_container)
 
     def render_boxplot(self, boxplot_data: List[Dict[str, Any]], fig_container: widgets.Box) -> go.FigureWidget:
         """渲染箱线图"""
@@ -271,18 +290,36 @@ class StatisticsChartRenderer:
             row = 1 + (i // cols_per_row)
             col = (i % cols_per_row) + 1
 
-            # 添加箱线图到对应子图
-            fig.add_trace(go.Box(
-                y=data['data'],
-                name=data['column'],
-                marker_color=color,
-                boxmean=True,
-                showlegend=False
-            ), row=row, col=col)
+            # 添加箱线图到对应子图；样本较多时只传统计量，异常值由下方散点单独绘制
+            if data['count'] > BOXPLOT_PRECOMPUTE_THRESHOLD:
+                box = go.Box(
+                    x=[data['column']],
+                    q1=[data['q1']],
+                    median=[data['median']],
+                    q3=[data['q3']],
+                    lowerfence=[data['whisker_low']],
+                    upperfence=[data['whisker_high']],
+                    mean=[data['mean']],
+                    name=data['column'],
+                    marker_color=color,
+                    boxmean=True,
+                    boxpoints=False,
+                    showlegend=False
+                )
+            else:
+                box = go.Box(
+                    y=data['data'],
+                    name=data['column'],
+                    marker_color=color,
+                    boxmean=True,
+                    showlegend=False
+                )
+            fig.add_trace(box, row=row, col=col)
 
-            # 添加异常值散点（如果有）
+            # 添加异常值散点（如果有）；点数较多时用 WebGL 渲染，避免 SVG 逐点绘制拖慢浏览器
             if data['outliers']:
-                fig.add_trace(go.Scatter(
+                scatter_cls = go.Scattergl if len(data['outliers']) > WEBGL_POINT_THRESHOLD else go.Scatter
+                fig.add_trace(scatter_cls(
                     x=[0] * len(data['outliers']),
                     y=data['outliers'],
                     mode='markers',
@@ -300,8 +337,7 @@ class StatisticsChartRenderer:
         # 添加子图边框并设置白色背景
         self._apply_subplot_borders(fig, rows=rows, cols=cols_per_row)
 
-        fig_container.children = [fig]
-        return fig
+        return self._show_figure(fig, fig_container)
 
     def render_histogram(self, columns: List[str], data_processor, fig_container: widgets.Box) -> go.FigureWidget:
         """渲染直方图"""
@@ -322,9 +358,8 @@ class StatisticsChartRenderer:
         for i, col in enumerate(columns):
             row = 1 + (i // cols_per_row)
             col_idx = (i % cols_per_row) + 1
-            hist_data, bin_edges = data_processor.get_histogram_data(col)
+            bin_centers, hist_data = data_processor.get_histogram_bars(col)
             if len(hist_data) > 0:
-                bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
                 fig.add_trace(
                     go.Bar(
                         x=bin_centers,
@@ -353,8 +388,7 @@ class StatisticsChartRenderer:
         self._apply_common_layout(fig, width=total_width, height=total_height, margin=dict(l=20, r=10, t=10, b=20))
         self._apply_subplot_borders(fig, rows=rows, cols=cols_per_row)
 
-        fig_container.children = [fig]
-        return fig
+        return self._show_figure(fig, fig_container)
 
     def render_density_plot(self, columns: List[str], data_processor, fig_container: widgets.Box) -> go.FigureWidget:
         """渲染密度图"""
@@ -366,11 +400,8 @@ class StatisticsChartRenderer:
         cols_per_row = math.ceil(cols / 2)
 
         # 计算20px间距对应的比例
-        per_col_size = max(self._subplot_min_px, int(self.figsize[1] * 72 * self._subplot_scale) - 10)
-        total_width = per_col_size * max(1, cols_per_row)
-        total_height = per_col_size * 2
-        horizontal_spacing_ratio = 40.0 / total_width if cols_per_row > 1 else 0.0
-        vertical_spacing_ratio = 40.0 / total_height
+        per_col_size, total_width, total_height, horizontal_spacing_ratio, vertical_spacing_ratio, _cols = \
+            self._compute_subplot_sizes(cols, rows=2)
 
         fig = make_subplots(rows=2, cols=cols_per_row, shared_xaxes=False, shared_yaxes=False,
                             horizontal_spacing=horizontal_spacing_ratio, vertical_spacing=vertical_spacing_ratio)
@@ -404,48 +435,12 @@ class StatisticsChartRenderer:
                 fig.update_yaxes(showticklabels=True, row=row, col=col_idx, tickfont=dict(size=11))
 
         # 每个子图为方形，宽度使用高度像素值
-        per_col_size = max(self._subplot_min_px, int(self.figsize[1] * 72 * self._subplot_scale) - 10)
-        total_width = per_col_size * max(1, cols_per_row)
         rows = 2
-        total_height = per_col_size * rows
-
-        fig.update_layout(
-            width=total_width,
-            height=total_height,
-            showlegend=False,
-            margin=dict(l=20, r=10, t=10, b=20)
-        )
+        self._apply_common_layout(fig, width=total_width, height=total_height, margin=dict(l=20, r=10, t=10, b=20))
         # 添加子图边框并设置白色背景
-        try:
-            shapes = []
-            rows = 2
-            cols = cols_per_row
-            for r in range(1, rows + 1):
-                for c in range(1, cols + 1):
-                    idx = (r - 1) * cols + c
-                    xaxis_name = 'xaxis' if idx == 1 else f'xaxis{idx}'
-                    yaxis_name = 'yaxis' if idx == 1 else f'yaxis{idx}'
-                    xaxis = getattr(fig.layout, xaxis_name, None)
-                    yaxis = getattr(fig.layout, yaxis_name, None)
-                    xdom = getattr(xaxis, 'domain', None) if xaxis is not None else None
-                    ydom = getattr(yaxis, 'domain', None) if yaxis is not None else None
-                    if xdom and ydom:
-                        shapes.append(dict(
-                            type="rect",
-                            xref="paper", yref="paper",
-                            x0=xdom[0], x1=xdom[1],
-                            y0=ydom[0], y1=ydom[1],
-                            line=dict(color="#d9d9d9", width=1),
-                            fillcolor="white",
-                            layer="below"
-                        ))
-            if shapes:
-                fig.update_layout(shapes=shapes, plot_bgcolor='white', paper_bgcolor='white')
-        except Exception:
-            pass
+        self._apply_subplot_borders(fig, rows=rows, cols=cols_per_row)
 
-        fig_container.children = [fig]
-        return fig
+        return self._show_figure(fig, fig_container)
 
     def render_chart(self, chart_type: str, data_processor, columns: List[str],
                     scatter_columns: Optional[Tuple[str, str]], fig_container: widgets.Box) -> go.FigureWidget:
@@ -43,8 +43,17 @@ DEFAULT_TITLE = "动态统计分析"
 DEFAULT_FIGSIZE = (16, 10)
 DEFAULT_CHART_TYPE = 'summary'
 
+# 列选择变化后延迟刷新图表的时间（秒）
+UPDATE_DEBOUNCE_SECONDS = 0.3
+
 # 直方图参数
 DEFAULT_HIST_BINS = 30
 
+# 单条散点轨迹超过该点数时改用 WebGL（Scattergl）渲染
+WEBGL_POINT_THRESHOLD = 10000
+
+# 列样本数超过该值时，箱线图只传递预先算好的统计量而不传原始数据
+BOXPLOT_PRECOMPUTE_THRESHOLD = 5000
+
 # 散点图相关参数
 DEFAULT_SCATTER_SIZE = 8
@@ -6,26 +6,53 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Any, Tuple
-from functools import lru_cache
+from functools import cached_property
 
-from .utils import calculate_basic_statistics, detect_outliers
+from .utils import calculate_basic_statistics, detect_outliers, numeric_columns
+from .kernels import boxplot_stats
+
+# 散点采样共用的随机数生成器（PCG64），避免每次采样重新创建
+_RNG = np.random.default_rng()
 
 
 class StatisticsDataProcessor:
-    """统计数据处理器"""
+    """统计数据处理器
+
+    只读持有传入的 DataFrame（不做拷贝），本类中的方法均不修改 self.df。
+    """
 
     def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+        # 直接引用而非拷贝：处理器不会修改数据，避免整表复制带来的内存翻倍
+        self.df = df
         self._stats_cache: Dict[str, Dict] = {}
+        # 每列去除缺失值后的 float64 数组，切换图表类型时复用
+        self._clean_arrays: Dict[str, np.ndarray] = {}
         self._clear_cache()
 
     def _clear_cache(self):
         """清空统计缓存"""
         self._stats_cache.clear()
+        self._clean_arrays.clear()
+        self.__dict__.pop('numeric_columns', None)
+
+    def _clean_array(self, column: str) -> np.ndarray:
+        """获取去除缺失值后的列数据（float64 只读数组，按列缓存）"""
+        clean = self._clean_arrays.get(column)
+        if clean is None:
+            values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            clean = values[~np.isnan(values)]
+            clean.flags.writeable = False
+            self._clean_arrays[column] = clean
+        return clean
+
+    @cached_property
+    def numeric_columns(self) -> List[str]:
+        """数值列列表（缓存）"""
+        return numeric_columns(self.df)
 
     def get_numeric_columns(self) -> List[str]:
         """获取数值列"""
-        return self.df.select_dtypes(include=['number']).columns.tolist()
+        return list(self.numeric_columns)
 
     def calculate_basic_statistics(self, columns: List[str]) -> pd.DataFrame:
         """计算基础统计量"""
@@ -35,28 +62,45 @@ class StatisticsDataProcessor:
         stats_data = {}
         for col in columns:
             if col in self.df.columns:
-                stats_data[col] = calculate_basic_statistics(self.df[col])
+                stats_data[col] = self._column_statistics(col)
 
         return pd.DataFrame(stats_data)
 
-    @lru_cache(maxsize=32)
+    def _column_statistics(self, column: str) -> Dict[str, Any]:
+        """计算单列统计量并按列缓存（数据只读，调整图表尺寸或切换图表时直接复用）"""
+        stats = self._stats_cache.get(column)
+        if stats is None:
+            stats = calculate_basic_statistics(self.df[column])
+            self._stats_cache[column] = stats
+        return stats
+
     def get_column_statistics(self, column: str) -> Dict[str, Any]:
         """获取单列统计信息（带缓存）"""
         if column not in self.df.columns:
             return {}
 
-        return calculate_basic_statistics(self.df[column])
+        return dict(self._column_statistics(column))
 
     def calculate_correlation_matrix(self, columns: List[str]) -> pd.DataFrame:
         """计算相关系数矩阵"""
         if len(columns) < 2:
             return pd.DataFrame()
 
-        numeric_cols = [col for col in columns if col in self.df.columns and self.df[col].dtype in ['int64', 'float64']]
+        numeric_set = set(self.numeric_columns)
+        numeric_cols = [col for col in columns if col in numeric_set]
         if len(numeric_cols) < 2:
             return pd.DataFrame()
+        numeric_df = self.df[numeric_cols]
 
-        return self.df[numeric_cols].corr()
+        values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(values).any():
+            # 存在缺失值时需要按列对成对剔除，交给 pandas 处理
+            return numeric_df.corr()
+
+        # 无缺失值时直接一次性计算相关系数矩阵
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = np.corrcoef(values, rowvar=False)
+        return pd.DataFrame(matrix, index=numeric_df.columns, columns=numeric_df.columns)
 
     def detect_outliers_iqr(self, column: str, multiplier: float = 1.5) -> Tuple[pd.Series, pd.Series]:
         """IQR方法检测异常值"""
@@ -66,23 +110,51 @@ class StatisticsDataProcessor:
         return detect_outliers(self.df[column], method='iqr', multiplier=multiplier)
 
     def get_histogram_data(self, column: str, bins: int = 30) -> Tuple[np.ndarray, np.ndarray]:
-        """获取直方图数据"""
+        """获取直方图数据，返回值与 np.histogram 相同：(频数, 分箱边界)"""
         if column not in self.df.columns:
             return np.array([]), np.array([])
 
-        clean_data = self.df[column].dropna()
-        if len(clean_data) == 0:
+        values = self._clean_array(column)
+        if len(values) == 0:
             return np.array([]), np.array([])
 
-        hist, bin_edges = np.histogram(clean_data, bins=bins)
+        lo, hi = values.min(), values.max()
+        span = hi - lo
+        with np.errstate(over='ignore', divide='ignore'):
+            scale = bins / span
+        if not np.isfinite(span) or span < np.finfo(np.float64).tiny or not np.isfinite(scale):
+            # 常数列、包含无穷值或跨度极小/极大（换算箱序号时会溢出）时交给 np.histogram 处理
+            return np.histogram(values, bins=bins)
+
+        # 等宽分箱：直接把数值映射为箱序号后 bincount，省去 np.histogram 的通用分支
+        bin_edges = np.linspace(lo, hi, bins + 1)
+        if not (bin_edges[1:] > bin_edges[:-1]).all():
+            # 相对跨度小于浮点精度，分箱边界重合，由 np.histogram 按原有方式报错
+            return np.histogram(values, bins=bins)
+        indices = ((values - lo) * scale).astype(np.intp)
+        np.minimum(indices, bins - 1, out=indices)
+        hist = np.bincount(indices, minlength=bins)
         return hist, bin_edges
 
+    def get_histogram_bars(self, column: str, bins: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """获取直方图柱形的绘图数据，返回 (分箱中心, 频数)"""
+        hist, bin_edges = self.get_histogram_data(column, bins)
+        if len(hist) == 0:
+            return np.array([]), np.array([])
+
+        # 分箱中心原地相加再减半，只分配一次
+        bin_centers = np.add(bin_edges[:-1], bin_edges[1:])
+        bin_centers *= 0.5
+
+        # 绘图数据无需双精度，降为 32 位以减小传给前端的数据量
+        return bin_centers.astype(np.float32), hist.astype(np.int32)
+
     def get_density_data(self, column: str, points: int = 100) -> Tuple[np.ndarray, np.ndarray]:
         """获取密度估计数据"""
         if column not in self.df.columns:
             return np.array([]), np.array([])
 
-        clean_data = self.df[column].dropna()
+        clean_data = self._clean_array(column)
         if len(clean_data) == 0:
             return np.array([]), np.array([])
 
@@ -91,7 +163,7 @@ class StatisticsDataProcessor:
             kde = gaussian_kde(clean_data)
             x_range = np.linspace(clean_data.min(), clean_data.max(), points)
             density = kde(x_range)
-            return x_range, density
+            return x_range.astype(np.float32), density.astype(np.float32)
         except ImportError:
             # 如果没有scipy，使用简单的直方图近似
             hist, bin_edges = self.get_histogram_data(column, bins=50)
@@ -102,7 +174,7 @@ class StatisticsDataProcessor:
             bin_width = bin_edges[1] - bin_edges[0]
             density = hist / (len(clean_data) * bin_width)
             x_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-            return x_centers, density
+            return x_centers.astype(np.float32), density.astype(np.float32)
 
     def prepare_boxplot_data(self, columns: List[str]) -> List[Dict[str, Any]]:
         """准备箱线图数据"""
@@ -112,20 +184,12 @@ class StatisticsDataProcessor:
             if col not in self.df.columns:
                 continue
 
-            clean_data = self.df[col].dropna()
-            if len(clean_data) == 0:
+            values = self._clean_array(col)
+            if len(values) == 0:
                 continue
 
-            # 计算箱线图统计量
-            q1 = clean_data.quantile(0.25)
-            median = clean_data.median()
-            q3 = clean_data.quantile(0.75)
-            iqr = q3 - q1
-            lower_whisker = clean_data[clean_data >= q1 - 1.5 * iqr].min()
-            upper_whisker = clean_data[clean_data <= q3 + 1.5 * iqr].max()
-
-            # 检测异常值
-            outliers = clean_data[(clean_data < lower_whisker) | (clean_data > upper_whisker)]
+            # 计算箱线图统计量并检测异常值（融合内核，一次完成）
+            q1, median, q3, lower_whisker, upper_whisker, outlier_mask = boxplot_stats(values)
 
             boxplot_data.append({
                 'column': col,
@@ -134,8 +198,11 @@ class StatisticsDataProcessor:
                 'q3': q3,
                 'whisker_low': lower_whisker,
                 'whisker_high': upper_whisker,
-                'outliers': outliers.tolist(),
-                'data': clean_data.tolist()
+                'mean': values.mean(),
+                'count': len(values),
+                'outliers': values[outlier_mask].tolist(),
+                # 原始数据保持为 NumPy 数组，由渲染器决定是否需要传给前端
+                'data': values
             })
 
         return boxplot_data
@@ -158,8 +225,10 @@ class StatisticsDataProcessor:
             return {}
 
         # 采样（如果指定了样本大小）
+        # Generator.choice 在样本远小于总体时走基于集合的快速路径，不会分配整段排列数组；
+        # shuffle=False 省去采样后的额外打乱
         if sample_size and len(x_clean) > sample_size:
-            sample_indices = np.random.choice(len(x_clean), size=sample_size, replace=False)
+            sample_indices = _RNG.choice(len(x_clean), size=sample_size, replace=False, shuffle=False)
             x_clean = x_clean.iloc[sample_indices]
             y_clean = y_clean.iloc[sample_indices]
 
@@ -0,0 +1,122 @@
+"""
+数值计算内核
+箱线图统计量与 IQR/Z-score 异常值检测等逐列计算的融合实现，安装了 numba 时使用 JIT 编译版本
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _whisker_scan_numpy(values: np.ndarray, lower_bound: float, upper_bound: float) -> Tuple[float, float, np.ndarray]:
+    """求须线与异常值掩码（纯 NumPy 实现）"""
+    whisker_low = values[values >= lower_bound].min()
+    whisker_high = values[values <= upper_bound].max()
+    outlier_mask = (values < whisker_low) | (values > whisker_high)
+    return whisker_low, whisker_high, outlier_mask
+
+
+def _bounds_mask_numpy(values: np.ndarray, lower_bound: float, upper_bound: float) -> np.ndarray:
+    """超出上下界的掩码（纯 NumPy 实现）"""
+    return (values < lower_bound) | (values > upper_bound)
+
+
+def _zscore_outlier_mask_numpy(values: np.ndarray, threshold: float) -> np.ndarray:
+    """Z-score 异常值掩码（纯 NumPy 实现，标准差与 pandas 一致取 ddof=1）"""
+    if len(values) < 2:
+        return np.zeros(len(values), dtype=bool)
+    std_val = values.std(ddof=1)
+    if std_val == 0:
+        return np.zeros(len(values), dtype=bool)
+    return np.abs((values - values.mean()) / std_val) > threshold
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _whisker_scan_jit(values, lower_bound, upper_bound):
+        """求须线与异常值掩码（numba 版本：一次扫描求须线，再一次扫描标记异常值）"""
+        whisker_low = np.inf
+        whisker_high = -np.inf
+        for v in values:
+            if lower_bound <= v < whisker_low:
+                whisker_low = v
+            if whisker_high < v <= upper_bound:
+                whisker_high = v
+
+        outlier_mask = np.empty(values.shape[0], dtype=np.bool_)
+        for i in range(values.shape[0]):
+            outlier_mask[i] = values[i] < whisker_low or values[i] > whisker_high
+        return whisker_low, whisker_high, outlier_mask
+
+    @njit(cache=True)
+    def _bounds_mask_jit(values, lower_bound, upper_bound):
+        """超出上下界的掩码（numba 版本：一次扫描完成比较）"""
+        outlier_mask = np.empty(values.shape[0], dtype=np.bool_)
+        for i in range(values.shape[0]):
+            outlier_mask[i] = values[i] < lower_bound or values[i] > upper_bound
+        return outlier_mask
+
+    @njit(cache=True)
+    def _zscore_outlier_mask_jit(values, threshold):
+        """Z-score 异常值掩码（numba 版本：两次扫描求均值与标准差，再一次扫描比较）"""
+        n = values.shape[0]
+        outlier_mask = np.zeros(n, dtype=np.bool_)
+        if n < 2:
+            return outlier_mask
+
+        total = 0.0
+        for v in values:
+            total += v
+        mean_val = total / n
+
+        sq_sum = 0.0
+        for v in values:
+            sq_sum += (v - mean_val) ** 2
+        std_val = np.sqrt(sq_sum / (n - 1))
+        if std_val == 0:
+            return outlier_mask
+
+        for i in range(n):
+            outlier_mask[i] = abs((values[i] - mean_val) / std_val) > threshold
+        return outlier_mask
+
+
+def boxplot_stats(values: np.ndarray, multiplier: float = 1.5) -> Tuple[float, float, float, float, float, np.ndarray]:
+    """
+    计算箱线图统计量。
+    values 须为不含 NaN 的一维 float64 数组，
+    返回 (q1, median, q3, whisker_low, whisker_high, outlier_mask)
+    """
+    # 分位数由 np.quantile 一次求出（内部为 introselect，比 JIT 内排序更快），其余扫描交给内核
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lower_bound = q1 - multiplier * iqr
+    upper_bound = q3 + multiplier * iqr
+    if NUMBA_AVAILABLE:
+        whisker_low, whisker_high, outlier_mask = _whisker_scan_jit(values, lower_bound, upper_bound)
+    else:
+        whisker_low, whisker_high, outlier_mask = _whisker_scan_numpy(values, lower_bound, upper_bound)
+    return q1, median, q3, whisker_low, whisker_high, outlier_mask
+
+
+def iqr_outlier_mask(values: np.ndarray, multiplier: float = 1.5) -> np.ndarray:
+    """IQR 方法的异常值掩码，values 须为不含 NaN 的一维 float64 数组"""
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    iqr = q3 - q1
+    lower_bound = q1 - multiplier * iqr
+    upper_bound = q3 + multiplier * iqr
+    if NUMBA_AVAILABLE:
+        return _bounds_mask_jit(values, lower_bound, upper_bound)
+    return _bounds_mask_numpy(values, lower_bound, upper_bound)
+
+
+def zscore_outlier_mask(values: np.ndarray, threshold: float = 3.0) -> np.ndarray:
+    """Z-score 方法的异常值掩码，values 须为不含 NaN 的一维 float64 数组"""
+    if NUMBA_AVAILABLE:
+        return _zscore_outlier_mask_jit(values, float(threshold))
+    return _zscore_outlier_mask_numpy(values, threshold)
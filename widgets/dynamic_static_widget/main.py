@@ -2,12 +2,13 @@
 动态统计分析组件主类
 """
 
+import asyncio
 import pandas as pd
 import ipywidgets as widgets
 from ipywidgets import VBox, Layout
 from typing import List, Dict, Optional, Tuple, Any
 
-from .constants import DEFAULT_TITLE, DEFAULT_FIGSIZE, DEFAULT_CHART_TYPE
+from .constants import DEFAULT_TITLE, DEFAULT_FIGSIZE, DEFAULT_CHART_TYPE, UPDATE_DEBOUNCE_SECONDS
 from .data_processor import StatisticsDataProcessor
 from .ui_components import StatisticsUIComponents
 from .chart_renderer import StatisticsChartRenderer
@@ -21,9 +22,14 @@ class DynamicStaticWidget(VBox):
                  figsize: Tuple[int, int] = DEFAULT_FIGSIZE):
         super().__init__(layout=Layout(width='100%'))
 
-        self.df = df.copy()
+        # 组件只读取数据，不做整表拷贝
+        self.df = df
         self.title = title
         self.figsize = figsize
+        # 列选择变化时的延迟刷新令牌：只有令牌仍为最新的回调才会真正刷新
+        self._update_token: Optional[object] = None
+        # 首张图表推迟到首次显示（或事件循环空闲）时才渲染
+        self._chart_rendered = False
 
         # 初始化组件（需要先初始化data_processor）
         self.data_processor = StatisticsDataProcessor(self.df)
@@ -50,8 +56,29 @@ class DynamicStaticWidget(VBox):
         # 绑定工具栏事件
         self._bind_toolbar_events()
 
-        # 初始化图表
-        self._update_chart()
+        # 初始化图表：构造时不渲染，嵌入在其他容器中显示（不经过 _ipython_display_）时由事件循环补上
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环（例如在脚本中直接调用）时立即渲染
+            self._ensure_chart_rendered()
+        else:
+            loop.call_soon(self._ensure_chart_rendered)
+
+    def _ensure_chart_rendered(self):
+        """渲染初始图表（此前已渲染过则跳过）"""
+        if not self._chart_rendered:
+            self._update_chart()
+
+    def _ipython_display_(self, **kwargs):
+        """在 Notebook 中显示组件，显示前先渲染初始图表"""
+        self._ensure_chart_rendered()
+        if not hasattr(self, '_repr_mimebundle_'):
+            # ipywidgets 7 通过 _ipython_display_ 显示
+            super()._ipython_display_(**kwargs)
+            return
+        from IPython.display import display
+        display(self._repr_mimebundle_(**kwargs), raw=True)
 
     def _get_default_columns(self) -> List[str]:
         """获取默认选择的列"""
@@ -81,6 +108,7 @@ class DynamicStaticWidget(VBox):
 
     def _update_chart(self):
         """更新图表显示"""
+        self._chart_rendered = True
         selected_columns = self.ui_components.get_selected_columns()
         chart_type = self.ui_components.chart_type_selector.value
         # 更新状态
@@ -98,21 +126,36 @@ class DynamicStaticWidget(VBox):
 
     def _on_column_selection_change(self, change, column):
         """列选择变化处理"""
-        # 延迟更新，避免频繁刷新
-        import threading
-        if hasattr(self, '_update_timer'):
-            self._update_timer.cancel()
+        # 延迟更新，避免频繁刷新；新的变化替换令牌，之前排队的回调到期后自动失效
+        token = self._update_token = object()
 
-        self._update_timer = threading.Timer(0.3, self._update_chart)
-        self._update_timer.start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环（例如在脚本中直接调用）时立即更新
+            self._update_chart()
+            return
+
+        loop.call_later(UPDATE_DEBOUNCE_SECONDS, self._debounced_update_chart, token)
+
+    def _debounced_update_chart(self, token):
+        """延迟刷新回调：只响应最近一次列选择变化"""
+        if token is self._update_token:
+            self._update_token = None
+            self._update_chart()
 
     def _on_chart_type_change(self, change):
         """图表类型变化处理"""
+        # 类型未变化（例如由 set_chart_type 同步选择器触发）时不重复渲染
+        if change.get('new') == self.state['chart_type']:
+            return
         self._update_chart()
 
     def _on_figsize_change(self, change):
         """图表尺寸变化处理"""
         new_size = change.get('new')
+        if new_size == self.figsize:
+            return
         if new_size and isinstance(new_size, tuple):
             try:
                 # 更新渲染器和状态
@@ -166,6 +209,9 @@ class DynamicStaticWidget(VBox):
     def set_columns(self, columns: List[str]):
         """设置要分析的列"""
         valid_columns = [col for col in columns if col in self.df.columns]
+        # 选择未变化时无需重建图表
+        if valid_columns == self.state['selected_columns']:
+            return
         self.state['selected_columns'] = valid_columns
         self.ui_components.set_selected_columns(valid_columns)
         self._update_chart()
@@ -175,6 +221,8 @@ class DynamicStaticWidget(VBox):
         from .constants import CHART_TYPE_OPTIONS
         valid_types = [option[1] for option in CHART_TYPE_OPTIONS]
         if chart_type in valid_types:
+            if chart_type == self.state['chart_type']:
+                return
             self.state['chart_type'] = chart_type
             self.ui_components.set_chart_type(chart_type)
             self._update_chart()
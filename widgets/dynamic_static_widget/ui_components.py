@@ -8,7 +8,7 @@ from ipywidgets import HBox, VBox, Layout, GridBox
 from typing import List, Dict, Optional, Any, Tuple
 
 from .constants import CHART_TYPE_OPTIONS, FIGSIZE_OPTIONS, STATISTICS_LABELS
-from .utils import get_default_color, create_dtype_icon, create_param_row
+from .utils import get_default_color, create_dtype_icon, numeric_columns
 
 
 class StatisticsUIComponents:
@@ -16,6 +16,8 @@ class StatisticsUIComponents:
 
     def __init__(self, df: pd.DataFrame):
         self.df = df
+        # 数值列只在初始化时计算一次，供各个 UI 事件复用
+        self._numeric_columns = numeric_columns(df)
 
         # 初始化组件
         self._init_components()
@@ -26,9 +28,13 @@ class StatisticsUIComponents:
         self.on_column_selection_change = None
         self.on_chart_type_change = None
         self.on_figsize_change = None
+        # 批量修改复选框时屏蔽单个复选框的变化通知
+        self._suppress_events = False
 
         # 列选择器
         self.column_selector_container = VBox(layout=Layout(width='280px'))
+        # (列名, 复选框) 列表，按列选择器中的顺序排列
+        self._checkbox_widgets: List[Tuple[str, widgets.Checkbox]] = []
 
         # 图表类型选择器
         self.chart_type_selector = widgets.Dropdown(
@@ -67,9 +73,15 @@ class StatisticsUIComponents:
         # 主布局容器
         self.main_layout = None
         self.left_panel = None
+        # create_main_ui 返回的顶层容器，重复调用时直接复用
+        self._top_ui: Optional[VBox] = None
+        self._events_bound = False
 
     def create_main_ui(self) -> VBox:
-        """创建主UI界面"""
+        """创建主UI界面（只构建一次，之后返回同一组件树）"""
+        if self.main_layout is not None:
+            return self._top_ui
+
         # 刷新列选择器
         self._refresh_column_selector()
 
@@ -105,10 +117,15 @@ class StatisticsUIComponents:
         self._bind_events()
 
         # 顶部放置工具栏，然后是主布局
-        return VBox([self.toolbar, self.main_layout], layout=Layout(width='100%'))
+        self._top_ui = VBox([self.toolbar, self.main_layout], layout=Layout(width='100%'))
+        return self._top_ui
 
     def _bind_events(self):
         """绑定事件处理器"""
+        # 避免重复绑定导致同一次变化触发多次回调
+        if self._events_bound:
+            return
+        self._events_bound = True
         self.chart_type_selector.observe(self._on_chart_type_change, names='value')
         # 监听图表尺寸变化
         self.figsize_selector.observe(self._on_figsize_change, names='value')
@@ -121,16 +138,21 @@ class StatisticsUIComponents:
     def _refresh_column_selector(self):
         """刷新列选择器"""
         # 获取数值列
-        numeric_columns = self.df.select_dtypes(include=['number']).columns.tolist()
+        numeric_columns = self._numeric_columns
 
         if not numeric_columns:
+            self._checkbox_widgets = []
             self.column_selector_container.children = [
                 widgets.HTML("<p style='color:gray;'>没有数值列可供分析</p>")
             ]
             return
 
-        # 创建列选择复选框
-        column_checkboxes = []
+        # dtypes 只取一次，循环中按列名索引，避免逐列 self.df[col] 取出整列
+        dtypes = self.df.dtypes
+
+        # 创建列选择复选框（所有列共用一个 GridBox，每列占一行三格，不再为每行创建 HBox）
+        checkbox_widgets = []
+        grid_children = []
         for col in numeric_columns:
             checkbox = widgets.Checkbox(
                 value=True,  # 默认全选
@@ -148,11 +170,16 @@ class StatisticsUIComponents:
             )
 
             # 数据类型图标
-            type_icon = create_dtype_icon(str(self.df[col].dtype))
+            type_icon = create_dtype_icon(dtypes[col])
 
-            # 创建行
-            row = create_param_row([checkbox, label, type_icon])
-            column_checkboxes.append(row)
+            checkbox_widgets.append((col, checkbox))
+            grid_children.extend([checkbox, label, type_icon])
+
+        self._checkbox_widgets = checkbox_widgets
+        column_grid = GridBox(
+            grid_children,
+            layout=Layout(grid_template_columns='25px 180px 36px', grid_gap='2px 0', align_items='center')
+        )
 
         # 添加全选/取消全选按钮
         select_all_btn = widgets.Button(
@@ -167,7 +194,7 @@ class StatisticsUIComponents:
 
         button_row = HBox([select_all_btn, select_none_btn], layout=Layout(margin='5px 0'))
 
-        self.column_selector_container.children = [button_row] + column_checkboxes
+        self.column_selector_container.children = [button_row, column_grid]
 
     def _refresh_scatter_selectors(self):
         """刷新散点图的轴选择器"""
@@ -183,6 +210,8 @@ class StatisticsUIComponents:
 
     def _on_column_checkbox_change(self, change, column):
         """列选择复选框变化处理"""
+        if self._suppress_events:
+            return
         if callable(self.on_column_selection_change):
             self.on_column_selection_change(change, column)
 
@@ -193,24 +222,20 @@ class StatisticsUIComponents:
 
     def _select_all_columns(self, select_all: bool):
         """全选或取消全选所有列"""
-        for child in self.column_selector_container.children[1:]:  # 跳过按钮行
-            if hasattr(child, 'children') and len(child.children) > 0:
-                checkbox = child.children[0]
-                if hasattr(checkbox, 'value'):
-                    checkbox.value = select_all
+        self._suppress_events = True
+        try:
+            for _, checkbox in self._checkbox_widgets:
+                checkbox.value = select_all
+        finally:
+            self._suppress_events = False
+
+        # 批量修改完成后只通知一次
+        if callable(self.on_column_selection_change):
+            self.on_column_selection_change({'name': 'value', 'new': select_all}, None)
 
     def get_selected_columns(self) -> List[str]:
         """获取选中的列"""
-        selected_columns = []
-        numeric_columns = self.df.select_dtypes(include=['number']).columns.tolist()
-
-        for i, child in enumerate(self.column_selector_container.children[1:], 0):  # 跳过按钮行
-            if hasattr(child, 'children') and len(child.children) > 0:
-                checkbox = child.children[0]
-                if hasattr(checkbox, 'value') and checkbox.value and i < len(numeric_columns):
-                    selected_columns.append(numeric_columns[i])
-
-        return selected_columns
+        return [col for col, checkbox in self._checkbox_widgets if checkbox.value]
 
     def get_scatter_columns(self) -> Tuple[Optional[str], Optional[str]]:
         """获取散点图的X轴和Y轴列"""
@@ -224,10 +249,12 @@ class StatisticsUIComponents:
 
     def set_selected_columns(self, columns: List[str]):
         """设置选中的列"""
-        numeric_columns = self.df.select_dtypes(include=['number']).columns.tolist()
-
-        for i, child in enumerate(self.column_selector_container.children[1:], 0):  # 跳过按钮行
-            if hasattr(child, 'children') and len(child.children) > 0:
-                checkbox = child.children[0]
-                if hasattr(checkbox, 'value') and i < len(numeric_columns):
-                    checkbox.value = numeric_columns[i] in columns
+        selected = set(columns)
+
+        # 由调用方负责刷新图表，这里不触发逐个复选框的变化通知
+        self._suppress_events = True
+        try:
+            for col, checkbox in self._checkbox_widgets:
+                checkbox.value = col in selected
+        finally:
+            self._suppress_events = False
@@ -5,9 +5,11 @@
 import pandas as pd
 import numpy as np
 import ipywidgets as widgets
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 
 from .constants import DEFAULT_COLORS
+from .kernels import iqr_outlier_mask, zscore_outlier_mask
 
 
 def is_timeseries_dataframe(df: pd.DataFrame, x_column: Optional[str] = None) -> bool:
@@ -25,42 +27,73 @@ def is_timeseries_dataframe(df: pd.DataFrame, x_column: Optional[str] = None) ->
     return False
 
 
+def numeric_columns(df: pd.DataFrame) -> List[str]:
+    """获取数值列名（直接扫描 dtypes，不构造 select_dtypes 的临时 DataFrame）"""
+    # 与 select_dtypes(include=['number']) 口径一致：数值（不含布尔）及 timedelta
+    mask = [
+        (pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype))
+        or pd.api.types.is_timedelta64_dtype(dtype)
+        for dtype in df.dtypes
+    ]
+    return df.columns[mask].tolist()
+
+
 def get_default_color(index: int) -> str:
     """获取默认颜色"""
     return DEFAULT_COLORS[index % len(DEFAULT_COLORS)]
 
 
-def create_dtype_icon(dtype: str) -> widgets.HTML:
-    """创建数据类型图标"""
-    dt_lower = dtype.lower()
-
-    if 'float' in dt_lower or 'int' in dt_lower or 'number' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 14 14" xmlns="http://www.w3.org/2000/svg">'
-                   '<rect x="1" y="8" width="2" height="5" fill="#2b7cff"/>'
-                   '<rect x="5" y="5" width="2" height="8" fill="#2b7cff"/>'
-                   '<rect x="9" y="3" width="2" height="10" fill="#2b7cff"/>'
-                   '</svg>')
-    elif 'datetime' in dt_lower or 'time' in dt_lower or 'date' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<circle cx="12" cy="12" r="10" stroke="#666" stroke-width="1" fill="none"/>'
-                   '<path d="M12 7v6l4 2" stroke="#666" stroke-width="1" fill="none" stroke-linecap="round"/>'
-                   '</svg>')
-    elif 'bool' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<rect x="2" y="6" width="20" height="12" rx="6" fill="#ddd"/>'
-                   '<circle cx="7" cy="12" r="3" fill="#4caf50"/>'
-                   '</svg>')
-    elif 'object' in dt_lower or 'str' in dt_lower or 'string' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<text x="4" y="16" font-size="12" fill="#444" font-family="Arial, sans-serif">A</text>'
-                   '</svg>')
+# 各数据类型类别对应的 SVG 图标
+_DTYPE_ICON_SVG = {
+    'number': ('<svg width="14" height="14" viewBox="0 0 14 14" xmlns="http://www.w3.org/2000/svg">'
+               '<rect x="1" y="8" width="2" height="5" fill="#2b7cff"/>'
+               '<rect x="5" y="5" width="2" height="8" fill="#2b7cff"/>'
+               '<rect x="9" y="3" width="2" height="10" fill="#2b7cff"/>'
+               '</svg>'),
+    'datetime': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+                 '<circle cx="12" cy="12" r="10" stroke="#666" stroke-width="1" fill="none"/>'
+                 '<path d="M12 7v6l4 2" stroke="#666" stroke-width="1" fill="none" stroke-linecap="round"/>'
+                 '</svg>'),
+    'bool': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+             '<rect x="2" y="6" width="20" height="12" rx="6" fill="#ddd"/>'
+             '<circle cx="7" cy="12" r="3" fill="#4caf50"/>'
+             '</svg>'),
+    'text': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+             '<text x="4" y="16" font-size="12" fill="#444" font-family="Arial, sans-serif">A</text>'
+             '</svg>'),
+    'unknown': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+                '<text x="4" y="16" font-size="12" fill="#999" font-family="Arial, sans-serif">?</text>'
+                '</svg>'),
+}
+
+# dtype.kind 到图标类别的映射
+_DTYPE_KIND_CATEGORY = {
+    'f': 'number', 'i': 'number', 'u': 'number', 'c': 'number',
+    'M': 'datetime', 'm': 'datetime',
+    'b': 'bool',
+    'O': 'text', 'U': 'text', 'S': 'text',
+}
+
+
+@lru_cache(maxsize=None)
+def _dtype_icon_html(dtype_name: str, kind: str) -> str:
+    """生成数据类型图标的 HTML（按 dtype 缓存）"""
+    icon_svg = _DTYPE_ICON_SVG[_DTYPE_KIND_CATEGORY.get(kind, 'unknown')]
+    return f'<span title="{dtype_name}" style="line-height:20px;">{icon_svg}</span>'
+
+
+def create_dtype_icon(dtype) -> widgets.HTML:
+    """创建数据类型图标（dtype 可以是 dtype 对象或 dtype 名称字符串）"""
+    if isinstance(dtype, str):
+        try:
+            kind = pd.api.types.pandas_dtype(dtype).kind
+        except TypeError:
+            kind = ''
     else:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<text x="4" y="16" font-size="12" fill="#999" font-family="Arial, sans-serif">?</text>'
-                   '</svg>')
+        kind = dtype.kind
 
     return widgets.HTML(
-        value=f'<span title="{dtype}" style="line-height:20px;">{icon_svg}</span>',
+        value=_dtype_icon_html(str(dtype), kind),
         layout=widgets.Layout(width='36px')
     )
 
@@ -92,15 +125,20 @@ def calculate_basic_statistics(data: pd.Series) -> Dict:
         }
 
     try:
+        # 在 NumPy 数组上计算，三个分位数由一次 np.quantile 得到
+        values = clean_data.to_numpy(dtype=np.float64)
+        q25, median, q75 = np.quantile(values, [0.25, 0.5, 0.75])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = values.std(ddof=1) if len(values) > 1 else np.nan
         return {
             'count': len(clean_data),
-            'mean': clean_data.mean(),
-            'std': clean_data.std(),
-            'min': clean_data.min(),
-            'max': clean_data.max(),
-            'median': clean_data.median(),
-            'q25': clean_data.quantile(0.25),
-            'q75': clean_data.quantile(0.75),
+            'mean': values.mean(),
+            'std': std,
+            'min': values.min(),
+            'max': values.max(),
+            'median': median,
+            'q25': q25,
+            'q75': q75,
             'skewness': clean_data.skew(),
             'kurtosis': clean_data.kurtosis(),
             'missing': len(data) - len(clean_data)
@@ -129,39 +167,18 @@ def detect_outliers(data: pd.Series, method: str = 'iqr', multiplier: float = 1.
     if len(clean_data) == 0:
         return pd.Series([], dtype=bool), pd.Series([], dtype=bool)
 
-    if method == 'iqr':
-        # IQR方法
-        Q1 = clean_data.quantile(0.25)
-        Q3 = clean_data.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - multiplier * IQR
-        upper_bound = Q3 + multiplier * IQR
+    values = clean_data.to_numpy(dtype=np.float64)
 
-        outliers = (clean_data < lower_bound) | (clean_data > upper_bound)
-        normal = ~outliers
-
-    elif method == 'zscore':
+    if method == 'zscore':
         # Z-score方法
-        mean_val = clean_data.mean()
-        std_val = clean_data.std()
-        if std_val == 0:
-            outliers = pd.Series(False, index=clean_data.index)
-        else:
-            z_scores = np.abs((clean_data - mean_val) / std_val)
-            outliers = z_scores > 3
-
-        normal = ~outliers
-
+        outlier_mask = zscore_outlier_mask(values, 3.0)
     else:
-        # 默认IQR方法
-        Q1 = clean_data.quantile(0.25)
-        Q3 = clean_data.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - multiplier * IQR
-        upper_bound = Q3 + multiplier * IQR
+        # IQR方法（默认）
+        outlier_mask = iqr_outlier_mask(values, multiplier)
 
-        outliers = (clean_data < lower_bound) | (clean_data > upper_bound)
-        normal = ~outliers
+    # 仅在返回时包装一次 Series（保留原列名）
+    outliers = pd.Series(outlier_mask, index=clean_data.index, name=data.name)
+    normal = ~outliers
 
     return outliers, normal
 
@@ -177,3 +194,24 @@ def format_statistic_value(value, precision: int = 4) -> str:
             return f"{value:.{precision}f}"
         except (ValueError, TypeError):
             return str(value)
+
+
+def format_statistic_array(values, precision: int = 4) -> List[str]:
+    """批量格式化统计数值（浮点数组一次性格式化，结果与 format_statistic_value 一致）"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'f':
+        formatted = np.char.mod(f'%.{precision}f', arr)
+        formatted[np.isnan(arr)] = '-'
+        return formatted.tolist()
+    if arr.dtype.kind in 'iu':
+        return arr.astype(str).tolist()
+    return [format_statistic_value(value, precision) for value in arr]
+
+
+def format_statistics_df(df: pd.DataFrame, precision: int = 4) -> pd.DataFrame:
+    """整表格式化统计数值，逐列批量处理，返回同形状的字符串 DataFrame"""
+    return pd.DataFrame(
+        {col: format_statistic_array(df[col].to_numpy(), precision) for col in df.columns},
+        index=df.index,
+        columns=df.columns
+    )
@@ -2,13 +2,16 @@
 图表渲染模块
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import ipywidgets as widgets
 from typing import List, Dict, Any, Optional, Tuple
 
-from .constants import DEFAULT_FIGSIZE
+from .constants import DEFAULT_FIGSIZE, DOWNSAMPLE_POINTS_PER_PIXEL, DOWNSAMPLE_TRIGGER_RATIO, WEBGL_POINT_THRESHOLD, \
+    HOVER_UNIFIED_POINT_LIMIT, FIGURE_TEMPLATE
+from .kernels import downsample_indices
 
 # 每个分栏子图的固定像素高度（分栏模式下每个参数的高度）
 DEFAULT_SUBPLOT_HEIGHT_PX = 200
@@ -19,11 +22,88 @@ class ChartRenderer:
     def __init__(self, figsize: Tuple[int, int] = DEFAULT_FIGSIZE):
         self.figsize = figsize
         self.fig = None
+        # 按系列缓存的数值数组与非缺失掩码 {(列名, 是否平滑, 平滑窗口, 行数): (values, mask)}
+        self._numeric_cache: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        # 按系列缓存的最小值与最大值（键同上），重绘时计算Y轴范围无需再扫描数组
+        self._range_cache: Dict[tuple, Tuple[float, float]] = {}
+        # 缓存的X轴数组 (行数, 传输格式的数组, 是否为日期)，日期已转换为毫秒时间戳，各 trace 共用
+        self._x_cache: Optional[Tuple[int, np.ndarray, bool]] = None
+        # 按 trace 顺序保存被降采样系列的完整数据 (x, y)（未降采样的为 None），缩放X轴时按可见范围重新降采样
+        self._full_traces: List[Optional[Tuple[np.ndarray, np.ndarray]]] = []
+        # 各 trace 当前显示的数据下标区间 [start, end)
+        self._trace_bounds: List[Tuple[int, int]] = []
+        # 上一次收到的X轴范围，用于判断范围是否变化
+        self._x_range: Optional[tuple] = None
+        # 最近一次绘图时计算的各Y轴范围 {坐标轴名: range}，对数轴切回线性轴时恢复
+        self._y_ranges: Dict[str, tuple] = {}
+        # 重绘同步布局期间为 True，此时 _full_traces 与 FigureWidget 中的 trace 尚未对应，暂不响应X轴范围变化
+        self._redrawing = False
+        # figsize 换算出的像素宽高缓存 (figsize, (宽, 高))
+        self._pixel_cache: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+
+    def clear_data_cache(self):
+        """数据视图变化（X轴、重采样等）后清空数值缓存"""
+        self._numeric_cache.clear()
+        self._range_cache.clear()
+        self._x_cache = None
+
+    def _x_values(self, processed_df: pd.DataFrame, x_column: Optional[str], is_timeseries: bool) -> Tuple[np.ndarray, bool]:
+        """
+        获取X轴数组（带缓存）及其是否为日期。
+        日期只在这里转换一次为毫秒时间戳，降采样、缩放与传输都直接使用该数组
+        """
+        if self._x_cache is None or self._x_cache[0] != len(processed_df):
+            if is_timeseries or x_column not in processed_df.columns:
+                x = processed_df.index
+            else:
+                x = processed_df[x_column]
+            if isinstance(x.dtype, pd.DatetimeTZDtype):
+                # 带时区的时间 to_numpy 得到 Timestamp 对象数组，只能逐点转成列表传输；
+                # 取本地时间得到 datetime64 数组（Plotly 前端本就忽略时区，显示不变）
+                x = x.dt.tz_localize(None) if isinstance(x, pd.Series) else x.tz_localize(None)
+            x_arr = x.to_numpy()
+            self._x_cache = (len(processed_df), self._trace_x(x_arr), x_arr.dtype.kind == 'M')
+        return self._x_cache[1], self._x_cache[2]
+
+    @staticmethod
+    def _series_key(processed_df: pd.DataFrame, s: Dict) -> tuple:
+        """系列数值缓存的键：列名、平滑配置与行数"""
+        return s['col'], s.get('smooth_enabled', False), s.get('smooth_window'), len(processed_df)
+
+    def _numeric_values(self, processed_df: pd.DataFrame, s: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """获取系列的 float64 数组与非缺失掩码（非数值转换为 NaN，按列与平滑配置缓存）"""
+        key = self._series_key(processed_df, s)
+        cached = self._numeric_cache.get(key)
+        if cached is None:
+            column = processed_df[s['col']]
+            if pd.api.types.is_numeric_dtype(column):
+                # 数值列直接取 float64 数组（float64 列为零拷贝视图），可空整数的缺失值转为 NaN
+                values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64)
+            cached = (values, ~np.isnan(values))
+            self._numeric_cache[key] = cached
+        return cached
+
+    def _value_range(self, processed_df: pd.DataFrame, s: Dict, values: np.ndarray) -> Tuple[float, float]:
+        """获取系列忽略 NaN 的最小值与最大值（带缓存），values 须至少含一个非 NaN 值"""
+        key = self._series_key(processed_df, s)
+        cached = self._range_cache.get(key)
+        if cached is None:
+            cached = (float(np.nanmin(values)), float(np.nanmax(values)))
+            self._range_cache[key] = cached
+        return cached
 
     def create_figure_widget(self) -> go.FigureWidget:
         """创建配置好的FigureWidget"""
-        fig = go.FigureWidget()
+        # 基础布局与模板随构造参数一并给出，不再在创建后单独调用 update_layout；
+        # 模板只设置在复用的 FigureWidget 上，每次重绘构建的 Figure 不再带模板
+        fig = go.FigureWidget(layout={**self._base_layout(), 'template': FIGURE_TEMPLATE})
         self._configure_figure_widget(fig)
+        # 缩放后按可见范围重新降采样；回调读取渲染器当前的 _full_traces，注册一次即可，重绘时无需重新注册。
+        # 分栏模式下各子图的X轴与 xaxis 联动（matches），缩放任一子图都会同步改变 xaxis 的范围；
+        # 同时监听 autorange：双击或“复位”按钮恢复全范围时需要按全部数据重新降采样
+        fig.layout.on_change(self._on_x_range_change, 'xaxis.range', 'xaxis.autorange')
         return fig
 
     def _configure_figure_widget(self, fig: go.FigureWidget):
@@ -41,27 +121,117 @@ class ChartRenderer:
         except:
             pass
 
-        # 设置基础布局 - 使用固定宽度以获得更好的显示效果
-        fig.update_layout(
-            autosize=False,  # 禁用自动调整大小
-            width=int(self.figsize[0] * 72) - 10,  # 转换为像素
-            height=int(self.figsize[1] * 72) - 10,  # 转换为像素
-            margin=dict(l=50, r=50, t=50, b=50),
-        )
-
         # 添加响应式CSS类
         try:
             fig.add_class('plotly-responsive')
         except:
             pass
 
+    def _pixel_size(self) -> Tuple[int, int]:
+        """figsize 对应的绘图区像素宽高（按 matplotlib 默认的 72 DPI 换算，figsize 变化时重新计算）"""
+        if self._pixel_cache is None or self._pixel_cache[0] != self.figsize:
+            dpi = 72
+            size = (int(self.figsize[0] * dpi) - 10, int(self.figsize[1] * dpi) - 10)
+            self._pixel_cache = (self.figsize, size)
+        return self._pixel_cache[1]
+
+    def _base_layout(self) -> Dict[str, Any]:
+        """按 figsize 计算的基础布局 - 使用固定宽度以获得更好的显示效果"""
+        width_px, height_px = self._pixel_size()
+        return dict(
+            autosize=False,  # 禁用自动调整大小
+            width=width_px,
+            height=height_px,
+            margin=dict(l=50, r=50, t=50, b=50),
+        )
+
+    @staticmethod
+    def _blank_layout() -> Dict[str, Any]:
+        """重绘时构建的 Figure 的初始布局：给出空模板，避免每次构建并深拷贝默认模板"""
+        return {'template': {}}
+
+    def get_figure_widget(self) -> go.FigureWidget:
+        """获取复用的 FigureWidget（首次调用时创建）"""
+        if self.fig is None:
+            self.fig = self.create_figure_widget()
+        return self.fig
+
+    @staticmethod
+    def _same_trace_structure(old, new) -> bool:
+        """两条 trace 的名称、类型与所在坐标轴一致时可以原地更新（未指定坐标轴即默认的 x/y 轴）"""
+        return (old.name == new.name and old.type == new.type
+                and (old.xaxis or 'x') == (new.xaxis or 'x') and (old.yaxis or 'y') == (new.yaxis or 'y'))
+
+    @classmethod
+    def _match_traces(cls, old_traces, new_traces) -> List[Optional[int]]:
+        """按先后顺序为每条新 trace 找到可原地更新的旧 trace 下标，找不到的为 None"""
+        matches = []
+        start = 0
+        for new in new_traces:
+            found = next((i for i in range(start, len(old_traces))
+                          if cls._same_trace_structure(old_traces[i], new)), None)
+            if found is not None:
+                start = found + 1
+            matches.append(found)
+        return matches
+
+    def _show_figure(self, widget: go.FigureWidget, fig: go.Figure, fig_container: widgets.Box) -> go.FigureWidget:
+        """
+        将构建好的 Figure 同步到复用的 FigureWidget 并放入容器。
+        同名且类型、坐标轴一致的 trace 在 batch_update 中原地更新（前端只收到一次 update，且只含有变化的属性）；
+        不再需要的 trace 删除、新增的 trace 插入，显示/隐藏或增减系列时不必重传其余 trace。
+        切换模式时不会新建 FigureWidget 重建画布。
+        """
+        matches = self._match_traces(widget.data, fig.data)
+        kept = [i for i in matches if i is not None]
+        if len(kept) < len(widget.data):
+            widget.data = tuple(widget.data[i] for i in kept)
+
+        layout_props = fig.layout.to_plotly_json()
+        # 模板保留 FigureWidget 上创建时设置的；新布局中已不存在的其它顶层属性置为 None 以便移除
+        layout_props.pop('template', None)
+        for key in widget.layout.to_plotly_json():
+            if key != 'template':
+                layout_props.setdefault(key, None)
+        layout_props['autosize'] = False
+        with widget.batch_update():
+            widget.layout.update(layout_props, overwrite=True)
+            for old, new in zip(widget.data, (t for t, i in zip(fig.data, matches) if i is not None)):
+                props = new.to_plotly_json()
+                props.pop('type', None)
+                old.update(props, overwrite=True)
+
+        # 布局（含新增的子图坐标轴）同步之后再加入新的 trace：先追加到末尾，再按新的顺序排列
+        added = [t for t, i in zip(fig.data, matches) if i is None]
+        if added:
+            widget.add_traces(added)
+            kept_traces = iter(widget.data[:len(kept)])
+            added_traces = iter(widget.data[len(kept):])
+            ordered = tuple(next(kept_traces) if i is not None else next(added_traces) for i in matches)
+            if any(a is not b for a, b in zip(ordered, widget.data)):
+                widget.data = ordered
+        if tuple(fig_container.children) != (widget,):
+            fig_container.children = [widget]
+        return widget
+
+    def update_trace_color(self, fig: go.FigureWidget, name: str, color: str) -> bool:
+        """只修改指定系列的线条颜色，找不到对应 trace 时返回 False"""
+        if not isinstance(fig, go.FigureWidget):
+            return False
+        traces = [trace for trace in fig.data if trace.name == name]
+        if not traces:
+            return False
+        with fig.batch_update():
+            for trace in traces:
+                trace.line.color = color
+        return True
+
     def update_figure_layout(self, fig: go.FigureWidget, title: str, yaxis_range: Optional[List[float]] = None,
-                           mode: str = 'overlay', series_count: int = 1, show_legend: bool = True):
-        """更新图表布局的通用方法"""
-        # 将figsize转换为像素 (matplotlib默认72 DPI)
-        dpi = 72
-        width_px = int(self.figsize[0] * dpi) - 10
-        base_height_px = int(self.figsize[1] * dpi) - 10
+                           mode: str = 'overlay', series_count: int = 1, show_legend: bool = True,
+                           total_points: int = 0):
+        """更新图表布局的通用方法（total_points 为各曲线的总点数，点数多时改用开销更小的悬停模式）"""
+        # 将figsize转换为像素
+        width_px, base_height_px = self._pixel_size()
 
         # 根据显示模式计算图形内部高度（像素）
         if mode == 'overlay':
@@ -77,13 +247,14 @@ class ChartRenderer:
         # 计算右边距：为图例和 modebar 留出适度空间（分栏模式也将图例放入绘图区内侧）
         right_margin = 30
 
+        # 基础布局（关闭自动尺寸、边距）与其余设置合并为一次 update_layout
         layout_kwargs = {
+            **self._base_layout(),
             'width': width_px,
             'height': height,
             'showlegend': show_legend,
             # 为右侧 legend 和 modebar 留出空间
             #'margin': dict(l=60, r=right_margin, t=80, b=50),
-            'template': 'plotly_white',
             'hovermode': 'x unified',
             # 使用 plotly 内置 title 布局，居中显示
             'title': {
@@ -96,6 +267,11 @@ class ChartRenderer:
             'title_x': 0.5
         }
 
+        if total_points > HOVER_UNIFIED_POINT_LIMIT:
+            # 点数多时只显示最近一条曲线的悬停信息，并关闭十字线的距离扫描
+            layout_kwargs['hovermode'] = 'x'
+            layout_kwargs['spikedistance'] = 0
+
         if show_legend:
             # 分栏模式下将图例放在绘图区外侧并在右边显示；叠加模式下放在绘图区内侧
             # 对于 split 模式也使用绘图区内侧的竖直图例（与 overlay 保持一致）
@@ -116,9 +292,32 @@ class ChartRenderer:
 
         fig.update_layout(**layout_kwargs)
 
-    def create_scatter_trace(self, trace_data: Dict[str, Any]) -> go.Scatter:
-        """创建scatter trace的通用方法"""
-        return go.Scatter(
+    def apply_view_options(self, fig: go.Figure, options: Optional[Dict[str, Any]]):
+        """
+        应用工具栏切换的显示选项，所有修改在一次 batch_update 中完成（FigureWidget 上只发送一条消息）。
+        options 中 yaxis_type 作用于所有Y轴，其余键（showlegend、dragmode、title_text、
+        xaxis_rangeslider_visible 等）直接作为 update_layout 的参数
+        """
+        if not options:
+            return
+        layout_kwargs = dict(options)
+        yaxis_type = layout_kwargs.pop('yaxis_type', None)
+        with fig.batch_update():
+            if yaxis_type == 'log':
+                # 绘图时给出的Y轴范围是线性坐标，对数轴会把它当作 10 的指数，改为自动范围
+                fig.update_yaxes(type='log', autorange=True)
+            elif yaxis_type is not None:
+                fig.update_yaxes(type=yaxis_type)
+                # 对数轴打开了自动范围，切回时恢复绘图时计算的范围并关闭自动范围，与首次绘制一致
+                for name, axis_range in self._y_ranges.items():
+                    fig.layout[name].update(range=axis_range, autorange=False)
+            if layout_kwargs:
+                fig.update_layout(**layout_kwargs)
+
+    def create_scatter_trace(self, trace_data: Dict[str, Any], webgl: bool = False) -> go.Scatter:
+        """创建scatter trace的通用方法，webgl 为 True 时使用 Scattergl"""
+        scatter_cls = go.Scattergl if webgl else go.Scatter
+        return scatter_cls(
             x=trace_data['x'],
             y=trace_data['y'],
             name=trace_data['name'],
@@ -127,51 +326,180 @@ class ChartRenderer:
             connectgaps=True
         )
 
+    @staticmethod
+    def _use_webgl(traces: List[Dict[str, Any]]) -> bool:
+        """总点数较多时用 WebGL 渲染，避免 SVG 逐点绘制拖慢浏览器"""
+        return sum(len(t['y']) for t in traces) > WEBGL_POINT_THRESHOLD
+
+    @staticmethod
+    def _trace_x(x: np.ndarray) -> np.ndarray:
+        """
+        datetime64 的X轴转换为毫秒时间戳（float64，NaT 转为 NaN）。
+        Plotly 会把 datetime64 数组逐点转成 ISO 字符串再传给前端，数值数组则以二进制整体传输；
+        配合 date 类型的X轴，前端显示与原来一致
+        """
+        if x.dtype.kind != 'M':
+            return x
+        ms = x.astype('datetime64[ns]').view(np.int64) / 1e6
+        nat = np.isnat(x)
+        if nat.any():
+            ms[nat] = np.nan
+        return ms
+
+    @staticmethod
+    def _trace_y(y: np.ndarray) -> np.ndarray:
+        """
+        Y值以 float32 传给前端，数据量减半（取值范围计算仍使用 float64）。
+        超出 float32 表示范围，或 float32 精度不足以区分曲线起伏（常数附近的微小波动）时保留 float64
+        """
+        if len(y) == 0:
+            return y
+        ymin, ymax = y.min(), y.max()
+        absmax = max(abs(ymin), abs(ymax))
+        if not np.isfinite(absmax) or absmax >= np.finfo(np.float32).max:
+            return y
+        # float32 的相对精度约为 1e-7，要求其舍入误差远小于曲线的起伏幅度
+        if ymax > ymin and absmax * np.finfo(np.float32).eps > (ymax - ymin) * 1e-4:
+            return y
+        return y.astype(np.float32)
+
+    def _downsample(self, x: np.ndarray, y: np.ndarray, width_px: int):
+        """点数远超绘图区像素时降采样，减少传给前端的数据量（x、y 须不含 NaN）"""
+        n_out = DOWNSAMPLE_POINTS_PER_PIXEL * width_px
+        if len(y) <= DOWNSAMPLE_TRIGGER_RATIO * n_out:
+            return x, y
+        indices = downsample_indices(x, y, n_out)
+        return x[indices], y[indices]
+
+    def _sync_x_range(self, widget: go.FigureWidget):
+        """重绘后按当前的X轴范围重新降采样（重绘前已缩放时保持放大后的细节）"""
+        self._x_range = None
+        self._on_x_range_change(widget.layout, widget.layout.xaxis.range, widget.layout.xaxis.autorange)
+
+    @staticmethod
+    def _range_bounds(x: np.ndarray, axis_range) -> Optional[Tuple[int, int]]:
+        """把X轴显示范围换算为已排序X数组上的下标区间（两端各多取一点，保证曲线延伸到边缘）"""
+        if x.dtype.kind not in 'iuf':
+            # 类别轴等无法按数值换算的X轴不处理
+            return None
+        # 日期轴（X为毫秒时间戳）的范围为日期字符串，由 Python 端设置时也可能是毫秒时间戳
+        lo, hi = (pd.Timestamp(v).value / 1e6 if isinstance(v, str) else float(v) for v in axis_range)
+        if lo > hi:
+            lo, hi = hi, lo
+        start = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+        end = min(int(np.searchsorted(x, hi, side='right')) + 1, len(x))
+        return start, end
+
+    def _on_x_range_change(self, layout, axis_range, autorange):
+        """
+        X轴缩放或平移后，按可见范围对被降采样的系列重新降采样，放大后能看到原始细节；
+        autorange 打开（复位）时恢复全范围
+        """
+        if self._redrawing or not any(full is not None for full in self._full_traces):
+            return
+        reset = autorange is True
+        previous, self._x_range = self._x_range, axis_range
+        if not reset and (axis_range is None or axis_range == previous):
+            return
+
+        widget = layout.figure
+        updates = []
+        for i, full in enumerate(self._full_traces):
+            if full is None or i >= len(widget.data):
+                continue
+            full_x, full_y = full
+            if reset:
+                bounds = (0, len(full_x))
+            else:
+                try:
+                    bounds = self._range_bounds(full_x, axis_range)
+                except (ValueError, TypeError):
+                    return
+            if bounds is None or bounds == self._trace_bounds[i]:
+                continue
+            self._trace_bounds[i] = bounds
+            start, end = bounds
+            trace_x, trace_y = self._downsample(full_x[start:end], full_y[start:end], self._pixel_size()[0])
+            updates.append((widget.data[i], trace_x, self._trace_y(trace_y)))
+
+        if updates:
+            with widget.batch_update():
+                for trace, trace_x, trace_y in updates:
+                    trace.x = trace_x
+                    trace.y = trace_y
+
+    def _build_trace(self, s: Dict, x_arr: np.ndarray, values: np.ndarray, mask: np.ndarray,
+                     width_px: int) -> Dict[str, Any]:
+        """由系列的完整数据生成 trace 数据：去掉缺失值、降采样，Y值转换为传输格式（x_arr 已是传输格式）"""
+        if mask.all():
+            # 没有缺失值时直接使用原数组，不做按掩码的复制
+            full_x, full_y = x_arr, values
+        else:
+            # 缺失值只在首尾（重采样对齐后常见）时按有效区间切片，得到视图而不是复制
+            start = int(mask.argmax())
+            end = len(mask) - int(mask[::-1].argmax())
+            if mask[start:end].all():
+                full_x, full_y = x_arr[start:end], values[start:end]
+            else:
+                full_x, full_y = x_arr[mask], values[mask]
+        trace_x, trace_y = self._downsample(full_x, full_y, width_px)
+        self._record_trace(full_x, full_y, trace_y)
+        return dict(x=trace_x, y=self._trace_y(trace_y), name=s['col'], color=s['color'])
+
+    def _record_trace(self, full_x: np.ndarray, full_y: np.ndarray, shown_y: np.ndarray):
+        """记录一条 trace 的完整数据，供缩放后重新降采样"""
+        self._full_traces.append((full_x, full_y) if len(shown_y) < len(full_y) else None)
+        self._trace_bounds.append((0, len(full_y)))
+
     def update_figure(self, fig: go.FigureWidget, title: str, processed_df: pd.DataFrame,
                      series: List[Dict], x_column: Optional[str], is_timeseries: bool,
-                     fig_container: widgets.Box):
-        """核心绘图逻辑"""
+                     fig_container: widgets.Box, layout_mode: str = 'overlay',
+                     view_options: Optional[Dict[str, Any]] = None):
+        """
+        核心绘图逻辑（fig 为容器中复用的 FigureWidget，新图在 go.Figure 上构建后一次性同步）。
+        layout_mode 为整张图的显示模式 overlay/split（不是系列的属性）；
+        view_options 为工具栏切换的显示选项（见 apply_view_options），重绘后保持不变
+        """
+        widget = fig if isinstance(fig, go.FigureWidget) else self.get_figure_widget()
         # 计算基础像素高度（与 update_figure_layout 保持一致）
-        dpi = 72
-        base_height_px = int(self.figsize[1] * dpi) - 10
-        width_px = int(self.figsize[0] * dpi) - 10
-        mode = series[0].get('layout_mode', 'overlay') if series else 'overlay'
-        visible_series = [s for s in series if s.get('visible')]
+        width_px, base_height_px = self._pixel_size()
+        # 只绘制处理后数据中存在的可见列，两种模式共用
+        columns = processed_df.columns
+        visible_series = [s for s in series if s.get('visible') and s['col'] in columns]
+        self._full_traces = []
+        self._trace_bounds = []
 
         if not visible_series:
             # 清空图表
-            fig.data = []
-            fig_container.children = [fig]
+            widget.data = ()
+            if tuple(fig_container.children) != (widget,):
+                fig_container.children = [widget]
             return
 
-        if mode == 'overlay':
-            # 叠加模式：创建新的FigureWidget以清除分栏模式残留并更新数据与布局
-            fig = self.create_figure_widget()
+        # X轴数组每次绘图只取一次（带缓存），各系列共用
+        x_arr, x_is_date = self._x_values(processed_df, x_column, is_timeseries)
 
-            # 先收集所有数值型数据以计算统一的y轴范围（忽略非数值）
-            all_y_values = []
+        if layout_mode == 'overlay':
+            # 各可见系列的数值数组取自缓存（非数值转换为 NaN 并在绘图前过滤）
             traces = []
-            x_values = processed_df.index if is_timeseries else (processed_df[x_column] if x_column in processed_df.columns else None)
+            # 逐系列累计最值，不再拼接数值矩阵
+            ymin, ymax = np.inf, -np.inf
 
             for s in visible_series:
-                # 强制转换为数值，非数值转换为 NaN 并在绘图前过滤
-                y_series = pd.to_numeric(processed_df.get(s['col'], pd.Series()), errors='coerce')
-                mask = ~y_series.isna()
-                if mask.sum() == 0:
+                values, mask = self._numeric_values(processed_df, s)
+                if not mask.any():
                     # 没有可绘制的数据，跳过该系列
                     continue
-                all_y_values.append(y_series[mask])
-                trace_x = x_values[mask] if x_values is not None else processed_df.index[mask]
-                traces.append(dict(x=trace_x, y=y_series[mask], name=s['col'], color=s['color']))
-
-            # debug removed
+                vmin, vmax = self._value_range(processed_df, s, values)
+                ymin = min(ymin, vmin)
+                ymax = max(ymax, vmax)
+                traces.append(self._build_trace(s, x_arr, values, mask, width_px))
 
             # 计算y轴范围
             yaxis_range = None
-            if all_y_values:
-                concat_y = pd.concat(all_y_values)
-                ymin = float(concat_y.min())
-                ymax = float(concat_y.max())
+            if traces:
+                ymin = float(ymin)
+                ymax = float(ymax)
                 if ymin == ymax:
                     # 常数序列，给出小幅度上下边距
                     delta = abs(ymin) * 0.01 if ymin != 0 else 1.0
@@ -181,51 +509,65 @@ class ChartRenderer:
                     margin = span * 0.05
                     yaxis_range = [ymin - margin, ymax + margin]
 
-            # 更新布局
-            self.update_figure_layout(fig, title, yaxis_range, mode='overlay', series_count=len(traces), show_legend=True)
+            # 叠加模式：所有 trace 在新 Figure 构造时一次性传入（只做一次校验），替换时清除分栏模式残留
+            webgl = self._use_webgl(traces)
+            fig = go.Figure(data=[self.create_scatter_trace(t, webgl=webgl) for t in traces], layout=self._blank_layout())
 
-            # 添加所有traces
-            for t in traces:
-                fig.add_trace(self.create_scatter_trace(t))
+            # 更新布局
+            self.update_figure_layout(fig, title, yaxis_range, mode='overlay', series_count=len(traces), show_legend=True,
+                                      total_points=sum(len(t['y']) for t in traces))
 
             # debug removed
 
-        elif mode == 'split':
+        elif layout_mode == 'split':
             # 分栏模式：重新创建多行子图结构
             rows = len(visible_series)
-            titles = [s['col'] for s in visible_series]
 
-            # 创建FigureWidget用于分栏模式（不在每个子图上显示标题，使用右侧图例辨识）
-            fig = self.create_figure_widget()
-            fig.set_subplots(
+            # 创建分栏模式的子图（不在每个子图上显示标题，使用右侧图例辨识）
+            fig = make_subplots(
                 rows=rows, cols=1,
                 shared_xaxes=True,
-                vertical_spacing=0.05
+                vertical_spacing=0.05,
+                figure=go.Figure(layout=self._blank_layout())
             )
+            # 每个可见的 trace 放在对应的子图中（去掉缺失值后降采样；曲线本就连接缺失处，显示不变）
+            traces = []
+            for s in visible_series:
+                y_arr, mask = self._numeric_values(processed_df, s)
+                traces.append(self._build_trace(s, x_arr, y_arr, mask, width_px))
+
             # 在分栏模式下显示右侧图例（通过 layout 控制）
-            self.update_figure_layout(fig, title, mode='split', series_count=rows, show_legend=True)
-
-            # 每个可见的 trace 放在对应的子图中
-            for i, s in enumerate(visible_series):
-                x_data = processed_df.index if is_timeseries else processed_df[x_column]
-                trace = self.create_scatter_trace({
-                    'x': x_data,
-                    'y': processed_df[s['col']],
-                    'name': s['col'],
-                    'color': s['color']
-                })
-                fig.add_trace(trace, row=i+1, col=1)
+            self.update_figure_layout(fig, title, mode='split', series_count=rows, show_legend=True,
+                                      total_points=sum(len(t['y']) for t in traces))
+
+            # 各子图的 trace 通过一次 add_traces 批量加入，避免逐条 add_trace 重复校验整张图
+            webgl = self._use_webgl(traces)
+            fig.add_traces([self.create_scatter_trace(t, webgl=webgl) for t in traces],
+                           rows=list(range(1, rows + 1)), cols=[1] * rows)
 
             # debug removed
 
-        # 更新容器
-        fig_container.children = [fig]
+        # X轴为毫秒时间戳时需显式声明为日期轴
+        if x_is_date:
+            fig.update_xaxes(type='date')
+        self._y_ranges = {axis.plotly_name: axis.range for axis in fig.select_yaxes() if axis.range is not None}
+        self.apply_view_options(fig, view_options)
+
+        # 同步到复用的 FigureWidget 并更新容器
+        self._redrawing = True
+        try:
+            self._show_figure(widget, fig, fig_container)
+        finally:
+            self._redrawing = False
+        self._sync_x_range(widget)
         # 容器高度控制策略：
         # - 叠加模式：容器高度与 figsize 保持一致（不出现额外滚动）
         # - 分栏模式：容器高度固定为 figsize 高度，图形内部高度会随参数数量变大，容器显示滚动条用于浏览
         try:
             # 只同步容器高度为 figsize 指定的高度；不要强制设置容器宽度，
             # 容器宽度由外部布局（left panel + grid）控制，避免页面溢出。
-            fig_container.layout.height = f"{int(base_height_px)}px"
+            height = f"{int(base_height_px)}px"
+            if fig_container.layout.height != height:
+                fig_container.layout.height = height
         except Exception:
             pass
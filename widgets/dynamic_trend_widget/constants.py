@@ -3,10 +3,10 @@
 """
 
 # 默认颜色列表
-DEFAULT_COLORS = [
+DEFAULT_COLORS = (
     '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
     '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-]
+)
 
 # 重采样选项
 RESAMPLE_OPTIONS = [
@@ -14,8 +14,8 @@ RESAMPLE_OPTIONS = [
     ('按分钟聚合', '1min'),
     ('按5分钟聚合', '5min'),
     ('按15分钟聚合', '15min'),
-    ('按小时聚合', '1H'),
-    ('按6小时聚合', '6H'),
+    ('按小时聚合', '1h'),
+    ('按6小时聚合', '6h'),
     ('按日聚合', '1D'),
     ('按周聚合', '1W'),
     ('按月聚合', '1M')
@@ -31,3 +31,30 @@ LAYOUT_MODE_OPTIONS = [
 DEFAULT_TITLE = "动态趋势图"
 DEFAULT_FIGSIZE = (16, 8)
 DEFAULT_SMOOTH_WINDOW = 5
+
+# 数据处理缓存的容量：重采样结果（按规则与列）与平滑后的列数组（按列、规则与窗口）
+RESAMPLE_CACHE_SIZE = 4
+SMOOTH_CACHE_SIZE = 64
+
+# 重采样的分箱数超过数据点数的该倍数时（时间轴有大段空缺或离群时间点），只对有数据的箱求平均
+RESAMPLE_SPARSE_RATIO = 10
+
+# 重采样的数据量（行数×列数）超过该值时，按列分块（每块列数）在线程池中并行求平均
+RESAMPLE_PARALLEL_MIN_CELLS = 2_000_000
+RESAMPLE_PARALLEL_CHUNK_COLUMNS = 8
+
+# 降采样：每条曲线保留的点数为绘图区像素宽度的倍数，原始点数超过目标点数该倍数时才降采样
+DOWNSAMPLE_POINTS_PER_PIXEL = 2
+DOWNSAMPLE_TRIGGER_RATIO = 4
+
+# 图表中各曲线总点数超过该值时改用 WebGL（Scattergl）渲染
+WEBGL_POINT_THRESHOLD = 10000
+
+# 趋势图使用的 Plotly 模板（只在创建 FigureWidget 时设置一次）
+FIGURE_TEMPLATE = 'plotly_white'
+
+# 图表中各曲线总点数超过该值时不再使用统一悬停提示（x unified 每次鼠标移动都要扫描所有点）
+HOVER_UNIFIED_POINT_LIMIT = 20000
+
+# 界面事件后延迟刷新图表的时间（秒），窗口内的连续变化只重绘一次
+UPDATE_DEBOUNCE_SECONDS = 0.05
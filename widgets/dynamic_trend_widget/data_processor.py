@@ -2,75 +2,250 @@
 数据处理模块
 """
 
+import os
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+from .constants import RESAMPLE_CACHE_SIZE, RESAMPLE_PARALLEL_CHUNK_COLUMNS, RESAMPLE_PARALLEL_MIN_CELLS, \
+    RESAMPLE_SPARSE_RATIO, SMOOTH_CACHE_SIZE
+from .kernels import NUMBA_AVAILABLE, bin_means, moving_average
+from .utils import resolve_resample_rule
+
 
 class DataProcessor:
     """数据处理器"""
 
     def __init__(self, df: pd.DataFrame, x_column: Optional[str] = None, is_timeseries: bool = False):
-        self.df = df.copy()
+        # 只保存引用：X轴的 datetime 转换与排序由组件按需完成，本类只处理传入的绘图数据，不修改原表
+        self.df = df
         self.x_column = x_column
         self.is_timeseries = is_timeseries
+        # 重采样结果缓存 {(规则, 列名元组, 行数): DataFrame}，最近使用的排在最后
+        self._resample_cache: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+        # 平滑结果缓存 {(列名, 规则, 窗口, 行数): ndarray}，只改动一个系列时其余系列不必重新平滑
+        self._smooth_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+
+    def clear_cache(self):
+        """数据本身或X轴（排序）变化后清空重采样与平滑缓存"""
+        self._resample_cache.clear()
+        self._smooth_cache.clear()
 
-        # 初始化数据处理
-        self._prepare_data()
+    @staticmethod
+    def _cache_get(cache: OrderedDict, key: tuple):
+        """读取缓存并标记为最近使用"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
 
-    def _prepare_data(self):
-        """准备数据：转换datetime并排序"""
-        if self.is_timeseries:
-            # 时间序列DataFrame：确保索引是datetime类型并排序
-            if not isinstance(self.df.index, pd.DatetimeIndex):
-                self.df.index = pd.to_datetime(self.df.index)
-            self.df = self.df.sort_index()
-        elif self.x_column and self.x_column in self.df.columns:
-            self.df[self.x_column] = pd.to_datetime(self.df[self.x_column])
-            self.df = self.df.sort_values(self.x_column)
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key: tuple, value, max_size: int):
+        """写入缓存，超出容量时丢弃最久未使用的项"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
 
     def apply_data_processing(self, df: pd.DataFrame, series: List[Dict], resample_rule: Optional[str] = None) -> pd.DataFrame:
         """应用数据聚合和平滑处理"""
-        processed_df = df.copy()
-
-        # 应用重采样
-        processed_df = self._apply_resampling(processed_df, resample_rule)
+        # 有系列启用平滑时，重采样须保留空箱：平滑按行位置滑动，空箱的 NaN 行把相隔很远的数据段隔开
+        allow_sparse = not any(s.get('smooth_enabled', False) and s['col'] in df.columns for s in series)
+        # 应用重采样（重采样返回新表，按规则与列缓存）
+        if resample_rule:
+            resample_key = (resample_rule, tuple(df.columns), len(df), allow_sparse)
+            processed_df = self._cache_get(self._resample_cache, resample_key)
+            if processed_df is None:
+                processed_df = self._apply_resampling(df, resample_rule, allow_sparse)
+                self._cache_put(self._resample_cache, resample_key, processed_df, RESAMPLE_CACHE_SIZE)
+        else:
+            processed_df = df
 
         # 对每个系列应用平滑
-        for s in series:
-            if s.get('smooth_enabled', False) and s['col'] in processed_df.columns:
-                window = s.get('smooth_window', 5)
-                processed_df = self._apply_smoothing(processed_df, s['col'], window)
+        smooth_series = [s for s in series
+                         if s.get('smooth_enabled', False) and s['col'] in processed_df.columns]
+        if smooth_series:
+            # 替换平滑列前做一次浅拷贝，避免写回调用方的表或缓存中的重采样结果
+            processed_df = processed_df.copy(deep=False)
+        # 窗口相同的列合并为一次 rolling 调用
+        columns_by_window: Dict[int, List[str]] = {}
+        for s in smooth_series:
+            columns = columns_by_window.setdefault(s.get('smooth_window', 5), [])
+            if s['col'] not in columns:
+                columns.append(s['col'])
+        n_rows = len(processed_df)
+        for window, columns in columns_by_window.items():
+            # 只平滑缓存中没有的列，其余列直接取缓存的数组
+            missing = [col for col in columns
+                       if (col, resample_rule, window, n_rows) not in self._smooth_cache]
+            if missing:
+                smoothed = self._apply_smoothing(processed_df[missing], missing, window)
+                for col in missing:
+                    self._cache_put(self._smooth_cache, (col, resample_rule, window, n_rows),
+                                    smoothed[col].to_numpy(), SMOOTH_CACHE_SIZE)
+            for col in columns:
+                processed_df[col] = self._cache_get(self._smooth_cache, (col, resample_rule, window, n_rows))
 
         return processed_df
 
-    def _apply_resampling(self, df: pd.DataFrame, resample_rule: Optional[str]) -> pd.DataFrame:
-        """应用重采样"""
+    def _apply_resampling(self, df: pd.DataFrame, resample_rule: Optional[str],
+                          allow_sparse: bool = True) -> pd.DataFrame:
+        """应用重采样，allow_sparse 为 False 时保留空箱（见 _resample_mean）"""
         if not resample_rule:
             return df
 
         try:
+            rule = resolve_resample_rule(resample_rule)
             if self.is_timeseries:
                 # 时间序列DataFrame：索引已经是datetime，直接重采样
-                return df.resample(resample_rule).mean()
+                if self._at_frequency(df.index, rule):
+                    return df
+                return self._resample_mean(df, rule, allow_sparse)
             elif self.x_column in df.columns:
+                if self._at_frequency(pd.DatetimeIndex(df[self.x_column]), rule):
+                    return df
                 df = df.set_index(self.x_column)
-                df = df.resample(resample_rule).mean()
+                df = self._resample_mean(df, rule, allow_sparse)
                 df = df.reset_index()
                 return df
         except Exception as e:
             print(f"重采样失败: {e}")
-            return df.copy()
+            return df
 
         return df
 
-    def _apply_smoothing(self, df: pd.DataFrame, column: str, window: int) -> pd.DataFrame:
-        """应用平滑处理"""
+    @staticmethod
+    def _resample_mean(df: pd.DataFrame, rule, allow_sparse: bool = True) -> pd.DataFrame:
+        """
+        按时间索引分箱求平均（所有列一次完成）。
+        时间轴有大段空缺或离群时间点时，resample 会为整个跨度内的每个空箱生成一行 NaN，
+        这些行在绘图时都会被丢弃；此时改为只对有数据的箱分组求平均，结果与去掉空箱后的 resample 相同。
+        结果还要按行位置平滑时（allow_sparse=False）不能去掉空箱，否则相隔很远的数据段会被平均到一起
+        """
         try:
-            # 使用滚动平均进行平滑
-            df[column] = df[column].rolling(
-                window=window, center=True, min_periods=1
-            ).mean()
-        except Exception as e:
-            print(f"平滑处理失败 ({column}): {e}")
+            step = pd.Timedelta(rule)
+        except (ValueError, TypeError):
+            # 月、周等非固定长度的频率
+            step = None
+        # 分组用 floor 按纪元零点对齐，只有整除一天的步长才与 resample 的按首日零点分箱一致
+        if allow_sparse and step is not None and len(df) > 0 and pd.Timedelta(days=1) % step == pd.Timedelta(0):
+            index = df.index
+            n_bins = (index.max() - index.min()) // step + 1
+            if n_bins > RESAMPLE_SPARSE_RATIO * len(df):
+                keys = index.floor(step)
+                return DataProcessor._mean_by_column_chunks(df, lambda frame: frame.groupby(keys).mean())
+        if step is not None:
+            regular = DataProcessor._regular_grid_mean(df, step)
+            if regular is not None:
+                return regular
+        return DataProcessor._mean_by_column_chunks(df, lambda frame: frame.resample(rule).mean())
+
+    @staticmethod
+    def _regular_grid_mean(df: pd.DataFrame, step: pd.Timedelta) -> Optional[pd.DataFrame]:
+        """
+        时间等间隔且分箱宽度为采样间隔的整数倍时，各箱在数据中的起止位置可以直接算出，按位置分段求平均，
+        不经过 resample 的分组过程。分箱与 resample 相同（从首日零点起算，首尾不完整的箱照常输出）；
+        不满足条件（不等间隔、带时区、非 NumPy 数值列等）时返回 None
+        """
+        index = df.index
+        if (not isinstance(index, pd.DatetimeIndex) or len(index) < 3 or index.tz is not None
+                or not all(isinstance(dtype, np.dtype) and dtype.kind in 'iufb' for dtype in df.dtypes)):
+            return None
+        freq = index.freq or index.inferred_freq
+        if freq is None:
+            return None
+        try:
+            spacing = pd.Timedelta(resolve_resample_rule(freq) if isinstance(freq, str) else freq)
+        except (ValueError, TypeError):
+            return None
+        if spacing <= pd.Timedelta(0) or step % spacing != pd.Timedelta(0) or step // spacing < 2:
+            return None
+        first = index[0]
+        origin = first.normalize()
+        lead = (first - origin) % step
+        if lead % spacing != pd.Timedelta(0):
+            # 采样点与箱边界错开，各箱点数不一致
+            return None
+
+        k = step // spacing
+        skip = lead // spacing
+        n = len(df)
+        # 各箱在数据中的起点：首箱缺少 skip 个点，其后每 k 个点一箱，末箱可以不满
+        starts = np.arange(k - skip if skip else 0, n, k)
+        if skip:
+            starts = np.concatenate(([0], starts))
+        values = df.to_numpy(dtype=np.float64)
+        if not NUMBA_AVAILABLE and np.isnan(values).any():
+            # 没有 numba 时，NumPy 版分段平均在数据含缺失值时并不比 resample 快
+            return None
+        means = bin_means(values, starts)
+        labels = pd.date_range(first - lead, periods=len(starts), freq=step, name=index.name, unit=index.unit)
+        return pd.DataFrame(means, index=labels, columns=df.columns)
+
+    @staticmethod
+    def _mean_by_column_chunks(df: pd.DataFrame, aggregate) -> pd.DataFrame:
+        """
+        对各列执行分箱平均。数据量大且列数多时按列分块在线程池中并行计算
+        （pandas 的分组聚合在计算时释放 GIL，线程间共享同一个 DataFrame，无需复制），结果按原列顺序拼接
+        """
+        n_cols = df.shape[1]
+        n_chunks = -(-n_cols // RESAMPLE_PARALLEL_CHUNK_COLUMNS)
+        workers = min(os.cpu_count() or 1, n_chunks)
+        if workers < 2 or df.size < RESAMPLE_PARALLEL_MIN_CELLS:
+            return aggregate(df)
+        chunks = [df.iloc[:, i:i + RESAMPLE_PARALLEL_CHUNK_COLUMNS]
+                  for i in range(0, n_cols, RESAMPLE_PARALLEL_CHUNK_COLUMNS)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(aggregate, chunks))
+        return pd.concat(parts, axis=1)
+
+    @staticmethod
+    def _at_frequency(index: pd.DatetimeIndex, rule) -> bool:
+        """
+        时间已是等间隔的该固定频率且与重采样分箱对齐时，重采样（每箱恰好一个点）不会改变数据，可以跳过。
+        inferred_freq 在同一个索引对象上有缓存
+        """
+        if len(index) < 3:
+            return False
+        freq = index.freq or index.inferred_freq
+        if freq is None:
+            return False
+        try:
+            step = pd.Timedelta(rule)
+            if pd.Timedelta(resolve_resample_rule(freq) if isinstance(freq, str) else freq) != step:
+                return False
+        except (ValueError, TypeError):
+            # 月、周等非固定长度的频率不做判断
+            return False
+        # 分箱从首日零点起算，首个时间须落在箱的起点上
+        first = index[0]
+        return (first - first.normalize()) % step == pd.Timedelta(0)
+
+    def _apply_smoothing(self, df: pd.DataFrame, columns: List[str], window: int) -> pd.DataFrame:
+        """应用平滑处理（同一窗口的多列一次完成）"""
+        try:
+            block = df[columns]
+            values = None
+            if all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+                values = block.to_numpy(dtype=np.float64, na_value=np.nan)
+            if values is not None and not np.isinf(values).any():
+                # 数值列用累加和实现的滑动平均，结果与下方的滚动平均一致
+                df[columns] = moving_average(values, window)
+            else:
+                # 使用滚动平均进行平滑
+                df[columns] = block.rolling(
+                    window=window, center=True, min_periods=1
+                ).mean()
+        except Exception:
+            # 批量失败时（例如含非数值列）逐列处理，只跳过出错的列
+            for column in columns:
+                try:
+                    df[column] = df[column].rolling(
+                        window=window, center=True, min_periods=1
+                    ).mean()
+                except Exception as e:
+                    print(f"平滑处理失败 ({column}): {e}")
 
         return df
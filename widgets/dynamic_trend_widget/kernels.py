@@ -0,0 +1,297 @@
+"""
+数值计算内核
+趋势曲线降采样（LTTB）、滑动平均平滑、等间隔数据的分段平均等逐点计算，安装了 numba 时使用 JIT 编译版本
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# JIT 内核是否已预热（见 warm_up）
+_warmed = False
+
+
+def _lttb_indices_numpy(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB 降采样（纯 NumPy 实现：各桶平均点一次向量化求出，逐桶循环只做面积比较）"""
+    n = x.shape[0]
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[n_out - 1] = n - 1
+
+    # 与 JIT 版本相同的分桶：第 i 个桶为 [bounds[i], bounds[i + 1])
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.arange(n_out) * every).astype(np.int64) + 1
+    # 第 i 个桶的第三个顶点为下一个桶 [bounds[i + 1], min(bounds[i + 2], n)) 的平均点；
+    # 这些区间首尾相连，用 reduceat 一次求和
+    starts = bounds[1:n_out - 1]
+    ends = np.minimum(bounds[2:], n)
+    counts = ends - starts
+    edges = np.append(starts, ends[-1]) if ends[-1] < n else starts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_x = np.where(counts > 0, np.add.reduceat(x, edges)[:n_out - 2] / counts, x[n - 1])
+        avg_y = np.where(counts > 0, np.add.reduceat(y, edges)[:n_out - 2] / counts, y[n - 1])
+
+    a = 0
+    for i in range(n_out - 2):
+        range_start = bounds[i]
+        range_end = bounds[i + 1]
+        if range_end > range_start:
+            ax = x[a]
+            ay = y[a]
+            area = np.abs((ax - avg_x[i]) * (y[range_start:range_end] - ay)
+                          - (ax - x[range_start:range_end]) * (avg_y[i] - ay))
+            a = range_start + int(np.argmax(area))
+        else:
+            a = range_start
+        indices[i + 1] = a
+    return indices
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _lttb_indices_jit(x, y, n_out):
+        """LTTB（Largest-Triangle-Three-Buckets）降采样，返回保留点的下标"""
+        n = x.shape[0]
+        indices = np.empty(n_out, dtype=np.int64)
+        indices[0] = 0
+        indices[n_out - 1] = n - 1
+
+        # 除首尾两点外，其余点平均分入 n_out - 2 个桶
+        every = (n - 2) / (n_out - 2)
+        a = 0
+        for i in range(n_out - 2):
+            # 下一个桶的平均点作为三角形的第三个顶点
+            avg_start = int((i + 1) * every) + 1
+            avg_end = min(int((i + 2) * every) + 1, n)
+            avg_x = 0.0
+            avg_y = 0.0
+            for j in range(avg_start, avg_end):
+                avg_x += x[j]
+                avg_y += y[j]
+            count = avg_end - avg_start
+            if count > 0:
+                avg_x /= count
+                avg_y /= count
+            else:
+                avg_x = x[n - 1]
+                avg_y = y[n - 1]
+
+            # 在当前桶中选取与上一个选中点、下一桶平均点围成面积最大的点
+            range_start = int(i * every) + 1
+            range_end = int((i + 1) * every) + 1
+            ax = x[a]
+            ay = y[a]
+            max_area = -1.0
+            chosen = range_start
+            for j in range(range_start, range_end):
+                area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+                if area > max_area:
+                    max_area = area
+                    chosen = j
+
+            indices[i + 1] = chosen
+            a = chosen
+        return indices
+
+
+def _as_float_axis(x: np.ndarray) -> np.ndarray:
+    """把X轴数据转换为用于计算面积的 float64 数组（datetime 取纳秒时间戳，其它非数值按位置）"""
+    if x.dtype.kind == 'M':
+        return x.view(np.int64).astype(np.float64)
+    if x.dtype.kind in 'iuf':
+        return x.astype(np.float64, copy=False)
+    return np.arange(len(x), dtype=np.float64)
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    计算降采样后保留的点的下标。
+    x、y 须为等长且不含 NaN 的一维数组，x 需已排序；使用 LTTB，安装了 numba 时为 JIT 版本
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n, dtype=np.int64)
+    lttb = _lttb_indices_jit if NUMBA_AVAILABLE else _lttb_indices_numpy
+    return lttb(_as_float_axis(x), y.astype(np.float64, copy=False), n_out)
+
+
+def _window_sums(csum: np.ndarray, left: int, right: int) -> np.ndarray:
+    """由前缀和（首行为 0）求居中窗口 [i - left, i + right) 内的和，窗口在两端截断"""
+    n = csum.shape[0] - 1
+    head = max(min(n - right + 1, n), 0)
+    sums = np.empty((n,) + csum.shape[1:], dtype=csum.dtype)
+    sums[:head] = csum[right:right + head]
+    sums[head:] = csum[n]
+    if left < n:
+        sums[left:] -= csum[:n - left]
+    return sums
+
+
+def _moving_average_numpy(values: np.ndarray, window: int) -> np.ndarray:
+    """居中滑动平均（纯 NumPy 实现：前缀和相减，耗时与窗口大小无关）"""
+    n = values.shape[0]
+    # 与 pandas rolling(center=True) 相同：第 i 个窗口覆盖 [i - window // 2, i + window - window // 2)
+    left = window // 2
+    right = window - left
+    valid = ~np.isnan(values)
+    has_nan = not valid.all()
+
+    # 先减去各列均值再累加，减小大偏移量数据在长累加中的舍入误差
+    if has_nan:
+        filled = np.where(valid, values, 0.0)
+        base = filled.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+        filled = np.where(valid, values - base, 0.0)
+    else:
+        base = values.mean(axis=0)
+        filled = values - base
+
+    csum = np.zeros((n + 1,) + values.shape[1:], dtype=np.float64)
+    np.cumsum(filled, axis=0, out=csum[1:])
+    total = _window_sums(csum, left, right)
+
+    if has_nan:
+        ccount = np.zeros((n + 1,) + values.shape[1:], dtype=np.int64)
+        np.cumsum(valid, axis=0, out=ccount[1:])
+        count = _window_sums(ccount, left, right)
+    else:
+        # 没有缺失值时各窗口的点数只取决于位置，按一维计算后广播到各列
+        count = _window_sums(np.arange(n + 1, dtype=np.int64), left, right)
+        count = count.reshape((n,) + (1,) * (values.ndim - 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 窗口内没有有效值时 0/0 得到 NaN，与 min_periods=1 一致
+        total /= count
+    total += base
+    return total
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _moving_average_jit(values, window):
+        """居中滑动平均（numba 版本：各列并行，逐列维护窗口内的和与有效点数）"""
+        n, k = values.shape
+        out = np.empty((n, k), dtype=np.float64)
+        left = window // 2
+        right = window - left
+        for c in prange(k):
+            # 先减去列均值再累加，减小大偏移量数据的舍入误差
+            base = 0.0
+            valid_total = 0
+            for i in range(n):
+                v = values[i, c]
+                if not np.isnan(v):
+                    base += v
+                    valid_total += 1
+            if valid_total > 0:
+                base /= valid_total
+
+            total = 0.0
+            count = 0
+            # 第一个窗口 [0, right)
+            for i in range(min(right, n)):
+                v = values[i, c]
+                if not np.isnan(v):
+                    total += v - base
+                    count += 1
+            for i in range(n):
+                out[i, c] = total / count + base if count > 0 else np.nan
+                # 窗口右移一位：加入 i + right，移出 i - left
+                j = i + right
+                if j < n:
+                    v = values[j, c]
+                    if not np.isnan(v):
+                        total += v - base
+                        count += 1
+                j = i - left
+                if j >= 0:
+                    v = values[j, c]
+                    if not np.isnan(v):
+                        total -= v - base
+                        count -= 1
+        return out
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    居中滑动平均，结果与 rolling(window, center=True, min_periods=1).mean() 一致。
+    values 为 float64 的一维数组或按列排列的二维数组（可含 NaN，不含 inf）
+    """
+    window = max(int(window), 1)
+    if NUMBA_AVAILABLE:
+        if values.ndim == 1:
+            return _moving_average_jit(values.reshape(-1, 1), window)[:, 0]
+        return _moving_average_jit(values, window)
+    return _moving_average_numpy(values, window)
+
+
+def _bin_means_numpy(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """分段平均（纯 NumPy 实现：reduceat 分段求和，只对含缺失值的列统计有效点数）"""
+    n = values.shape[0]
+    sums = np.add.reduceat(values, starts, axis=0)
+    counts = np.repeat(np.diff(np.append(starts, n))[:, None], values.shape[1], axis=1)
+    nan_cols = np.flatnonzero(np.isnan(values).any(axis=0))
+    if len(nan_cols):
+        block = values[:, nan_cols]
+        missing = np.isnan(block)
+        sums[:, nan_cols] = np.add.reduceat(np.where(missing, 0.0, block), starts, axis=0)
+        counts[:, nan_cols] -= np.add.reduceat(missing, starts, axis=0, dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 段内没有有效值时 0/0 得到 NaN
+        return sums / counts
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _bin_means_jit(values, starts):
+        """分段平均（numba 版本：各列并行，一次遍历同时累计和与有效点数）"""
+        n, k = values.shape
+        n_bins = starts.shape[0]
+        out = np.empty((n_bins, k), dtype=np.float64)
+        for c in prange(k):
+            for b in range(n_bins):
+                end = starts[b + 1] if b + 1 < n_bins else n
+                total = 0.0
+                count = 0
+                for i in range(starts[b], end):
+                    v = values[i, c]
+                    if not np.isnan(v):
+                        total += v
+                        count += 1
+                out[b, c] = total / count if count > 0 else np.nan
+        return out
+
+
+def bin_means(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    按行分段求各列忽略 NaN 的平均值，第 i 段为 [starts[i], starts[i + 1])，最后一段到末尾；
+    段内没有有效值时为 NaN。values 为 float64 二维数组，starts 为递增的 int64 数组且首项为 0
+    """
+    if NUMBA_AVAILABLE:
+        return _bin_means_jit(values, starts)
+    return _bin_means_numpy(values, starts)
+
+
+def warm_up():
+    """
+    用极小的数组预先调用一次 JIT 内核，加载（或首次编译）各签名，
+    使交互中第一次平滑、降采样不再承担编译与加载耗时。
+    由趋势组件在首次创建时调用（导入本模块不做任何计算），之后的调用直接返回
+    """
+    global _warmed
+    if _warmed or not NUMBA_AVAILABLE:
+        return
+    _warmed = True
+    try:
+        values = np.zeros((4, 2), dtype=np.float64)
+        # DataFrame.to_numpy 得到的多列数组为列优先，一维序列 reshape 后为行优先，两种布局都需预热
+        moving_average(values, 3)
+        moving_average(np.asfortranarray(values), 3)
+        bin_means(np.asfortranarray(values), np.array([0, 2], dtype=np.int64))
+        x = np.arange(8, dtype=np.float64)
+        _lttb_indices_jit(x, x, 4)
+    except Exception:
+        # 预热失败（例如缓存目录不可写导致编译出错）不影响使用，首次调用时再按需编译
+        pass
@@ -2,37 +2,59 @@
 动态趋势组件主类
 """
 
+import asyncio
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import ipywidgets as widgets
+from functools import partial
+from IPython.display import display, HTML, Image
 from ipywidgets import VBox, Layout
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 
-from .constants import DEFAULT_TITLE, DEFAULT_FIGSIZE, DEFAULT_SMOOTH_WINDOW
-from .utils import is_timeseries_dataframe, get_default_color
+from .constants import DEFAULT_TITLE, DEFAULT_FIGSIZE, DEFAULT_SMOOTH_WINDOW, UPDATE_DEBOUNCE_SECONDS
+from .utils import is_timeseries_dataframe, get_default_color, fast_to_datetime
 from .data_processor import DataProcessor
 from .ui_components import UIComponents
 from .chart_renderer import ChartRenderer
+from .kernels import warm_up
 
 
 class DynamicTrendWidget(VBox):
     """动态趋势图组件"""
 
+    # Y轴参数表格中每个系列依次占用的网格单元格（对应 _row_widgets 中各控件的键）
+    _Y_AXIS_ROW_CELLS = ('visible_cb', 'color', 'smooth_cb', 'smooth_win', 'label')
+
     def __init__(self, df: pd.DataFrame, x_column: Optional[str] = None, y_columns: Optional[List[str]] = None,
                  title: str = DEFAULT_TITLE, figsize: Tuple[int, int] = DEFAULT_FIGSIZE):
         super().__init__(layout=Layout(width='100%'))
+        # 首次创建组件时预热数值内核（只执行一次），交互中第一次平滑、降采样不再等待编译
+        warm_up()
 
-        self.df = df.copy()
+        # 浅拷贝：列数据与调用方共享，只有被转换的X轴列/索引会在本组件内替换，不影响原始 DataFrame
+        self.df = df.copy(deep=False)
         self.title = title
         self.x_column = x_column
         self.y_columns = y_columns or []
         self.figsize = figsize
 
+        # 已转换为 datetime 的X轴列；排序下标 _sort_idx 对应的X轴（None 表示已有序，无需重排）
+        self._converted_x: Set[str] = set()
+        self._sorted_by: Optional[str] = None
+        self._sort_idx: Optional[np.ndarray] = None
+        # 上一次按X轴排好序的绘图数据 (标签, DataFrame)：绘图列与排序不变时（平滑、显示切换等）直接复用
+        self._plot_frame_cache: Optional[Tuple[tuple, pd.DataFrame]] = None
+
         # 检测是否为时间序列DataFrame
         self.is_timeseries = is_timeseries_dataframe(self.df, self.x_column)
         if self.is_timeseries and self.x_column is None:
             # 时间序列DataFrame自动使用索引作为X轴
             self.x_column = '__index__'
 
+        if self.x_column:
+            self._ensure_x_prepared(self.x_column)
+
         # 初始化组件
         self.data_processor = DataProcessor(self.df, self.x_column, self.is_timeseries)
         self.ui_components = UIComponents(self.df, self.x_column, self.is_timeseries)
@@ -53,6 +75,18 @@ class DynamicTrendWidget(VBox):
         self._pending_colors: Dict[str, str] = {}
         # 用于在添加系列前临时保存每列的平滑配置 {'col': {'enabled': bool, 'window': int}}
         self._pending_smooth: Dict[str, Dict] = {}
+        # 列名到系列字典的索引，与 state['series'] 同步维护，按列查找系列时无需遍历列表
+        self._series_by_col: Dict[str, Dict] = {}
+        # Y轴参数表格的行控件，按列名缓存：{列名: {color, visible_cb, smooth_cb, smooth_win, label}}
+        self._row_widgets: Dict[str, Dict[str, widgets.Widget]] = {}
+        # 上一次绘图状态的标签，相同时跳过重绘
+        self._last_plot_key: Optional[tuple] = None
+        # 上一次绘图时的数据视图标签（X轴、重采样、数据对象），变化时清空渲染器的数值缓存
+        self._last_data_key: Optional[tuple] = None
+        # 工具栏切换的显示选项（Y轴尺度、图例、范围滑条、标题、拖动模式），每次重绘后重新应用
+        self._layout_state: Dict[str, object] = {}
+        # 界面事件的延迟刷新令牌：只有令牌仍为最新的回调才会真正重绘
+        self._update_token: Optional[object] = None
 
         # 初始化UI组件的事件监听
         # toolbar 绑定标识（避免重复绑定）
@@ -65,12 +99,63 @@ class DynamicTrendWidget(VBox):
         # 如果有完整的参数，初始化图表并绘制
         if self.x_column and self.y_columns:
             self._init_series_state()
+            self._refresh_y_axis_table()
             self._init_figure()
             self._update_figure()
         else:
             # 显示参数选择界面
             self._show_param_selection()
 
+    def _sort_key(self) -> Optional[str]:
+        """当前X轴的排序标识（时间序列使用索引）"""
+        return '__index__' if self.is_timeseries else self.x_column
+
+    def _ensure_x_prepared(self, col: Optional[str]):
+        """
+        确保X轴已转换为 datetime 并求出排序下标，已处理过的列直接跳过。
+        不再重排整个 DataFrame，只在绘图时按 _sort_idx 重排用到的列。
+        """
+        if self.is_timeseries:
+            # 时间序列DataFrame：确保索引是datetime类型
+            if not isinstance(self.df.index, pd.DatetimeIndex):
+                self.df.index = fast_to_datetime(self.df.index)
+            key, x_values = '__index__', self.df.index
+        else:
+            if col not in self.df.columns:
+                return
+            if col not in self._converted_x or not pd.api.types.is_datetime64_any_dtype(self.df[col]):
+                self.df[col] = fast_to_datetime(self.df[col])
+                self._converted_x.add(col)
+                self._plot_frame_cache = None
+                # 该列类型已变化，参数表中的数值列需要重新计算（构造阶段UI组件尚未创建）
+                if hasattr(self, 'ui_components'):
+                    self.ui_components.invalidate_numeric_columns()
+            key, x_values = col, self.df[col]
+
+        if self._sorted_by != key:
+            self._sort_idx = None if x_values.is_monotonic_increasing else np.argsort(x_values.to_numpy(), kind='stable')
+            self._sorted_by = key
+
+    def _plot_frame(self) -> pd.DataFrame:
+        """取出绘图用到的列（X轴列与各系列列），并按X轴排序"""
+        columns = []
+        if not self.is_timeseries and self.x_column in self.df.columns:
+            columns.append(self.x_column)
+        for s in self.state['series']:
+            if s['col'] in self.df.columns and s['col'] not in columns:
+                columns.append(s['col'])
+
+        sort_key = self._sort_key()
+        key = (tuple(columns), sort_key, self._sorted_by, id(self.df), len(self.df))
+        if self._plot_frame_cache is not None and self._plot_frame_cache[0] == key:
+            return self._plot_frame_cache[1]
+
+        frame = self.df[columns]
+        if self._sort_idx is not None and self._sorted_by == sort_key:
+            frame = frame.take(self._sort_idx)
+        self._plot_frame_cache = (key, frame)
+        return frame
+
     def _setup_event_handlers(self):
         """设置事件处理器"""
         # 模式选择器
@@ -100,59 +185,25 @@ class DynamicTrendWidget(VBox):
             }
             for i, col in enumerate(self.y_columns)
         ]
+        self._series_by_col = {s['col']: s for s in self.state['series']}
+
+    def _add_series(self, series: Dict):
+        """追加一个系列并同步列名索引"""
+        self.state['series'].append(series)
+        self._series_by_col[series['col']] = series
+
+    def _remove_series(self, col: str):
+        """移除指定列的系列并同步列名索引"""
+        if self._series_by_col.pop(col, None) is not None:
+            self.state['series'] = [s for s in self.state['series'] if s['col'] != col]
 
     def _init_figure(self):
         """初始化图表对象"""
-        fig = self.chart_renderer.create_figure_widget()
-        self.ui_components.fig_container.children = [fig]
+        # 渲染器内部复用同一个 FigureWidget，之后的更新都在它上面进行
+        fig = self.chart_renderer.get_figure_widget()
+        if tuple(self.ui_components.fig_container.children) != (fig,):
+            self.ui_components.fig_container.children = [fig]
         # 不在此处绑定 toolbar，绑定已在事件初始化时完成（绑定的是按需获取当前 fig 的 handler）
-        # 保留 _wire_toolbar 作历史兼容，但不主动调用它以避免重复绑定
-
-    def _wire_toolbar(self, fig):
-        """将自定义工具栏按钮绑定到 FigureWidget 的操作（重置、缩放、平移、导出）"""
-        ui = self.ui_components
-
-        # 重置视图
-        def on_reset(btn):
-            try:
-                fig.update_xaxes(autorange=True)
-                fig.update_yaxes(autorange=True)
-            except Exception:
-                pass
-
-        ui.toolbar_reset.on_click(on_reset)
-
-        # 缩放/平移按钮（普通按钮，每次点击启用对应模式）
-        def on_zoom_click(btn):
-            try:
-                fig.update_layout(dragmode='zoom')
-            except Exception:
-                pass
-
-        def on_pan_click(btn):
-            try:
-                fig.update_layout(dragmode='pan')
-            except Exception:
-                pass
-
-        ui.toolbar_zoom.on_click(on_zoom_click)
-        ui.toolbar_pan.on_click(on_pan_click)
-
-        # 导出为 PNG（显示在 notebook 中）
-        def on_save(btn):
-            try:
-                # 使用 FigureWidget 的 to_image 方法（需要支持的后端，如 kaleido）
-                img_bytes = fig.to_image(format='png')
-                from IPython.display import display, Image
-                display(Image(img_bytes))
-            except Exception as e:
-                try:
-                    from IPython.display import display, HTML
-                    display(HTML(f"<pre style='color:red;'>导出失败: {e}</pre>"))
-                except Exception:
-                    pass
-
-        ui.toolbar_save.on_click(on_save)
 
     def _bind_toolbar_actions(self):
         """绑定 toolbar 按钮（一次性绑定），处理函数在点击时动态获取当前 FigureWidget"""
@@ -161,40 +212,25 @@ class DynamicTrendWidget(VBox):
         ui = self.ui_components
 
         def get_current_fig():
-            try:
-                if ui.fig_container.children and len(ui.fig_container.children) > 0:
-                    return ui.fig_container.children[0]
-            except Exception:
-                pass
+            # 容器中可能是参数选择界面的占位提示，只有 FigureWidget 才响应工具栏操作
+            children = ui.fig_container.children
+            if children and isinstance(children[0], go.FigureWidget):
+                return children[0]
             return None
 
         def on_reset(btn):
             fig = get_current_fig()
             if fig is None:
                 return
-            try:
+            with fig.batch_update():
                 fig.update_xaxes(autorange=True)
                 fig.update_yaxes(autorange=True)
-            except Exception:
-                pass
 
         def on_zoom_click(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                fig.update_layout(dragmode='zoom')
-            except Exception:
-                pass
+            self._patch_layout(get_current_fig(), dragmode='zoom')
 
         def on_pan_click(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                fig.update_layout(dragmode='pan')
-            except Exception:
-                pass
+            self._patch_layout(get_current_fig(), dragmode='pan')
 
         def on_save(btn):
             fig = get_current_fig()
@@ -202,66 +238,32 @@ class DynamicTrendWidget(VBox):
                 return
             try:
                 img_bytes = fig.to_image(format='png')
-                from IPython.display import display, Image
                 display(Image(img_bytes))
             except Exception as e:
                 try:
-                    from IPython.display import display, HTML
                     display(HTML(f"<pre style='color:red;'>导出失败: {e}</pre>"))
                 except Exception:
                     pass
 
         # 新增：切换 Y 轴尺度（linear <-> log）
+        # 各切换按钮的当前状态取自 _layout_state，不再逐层读取 fig.layout
         def on_toggle_yscale(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                # 尝试读取当前 yaxis.type，默认 linear
-                current_type = getattr(getattr(fig.layout, 'yaxis', None), 'type', None) or 'linear'
-                new_type = 'log' if current_type != 'log' else 'linear'
-                fig.update_yaxes(type=new_type)
-            except Exception:
-                pass
+            current_type = self._layout_state.get('yaxis_type', 'linear')
+            self._patch_layout(get_current_fig(), yaxis_type='log' if current_type != 'log' else 'linear')
 
         # 新增：切换图例显示/隐藏
         def on_toggle_legend(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                current_show = bool(getattr(fig.layout, 'showlegend', True))
-                fig.update_layout(showlegend=not current_show)
-            except Exception:
-                pass
+            self._patch_layout(get_current_fig(), showlegend=not self._layout_state.get('showlegend', True))
 
         # 新增：显示/隐藏范围滑条（Range Slider）
         def on_toggle_rangeslider(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                # 尝试读取 xaxis.rangeslider.visible
-                xaxis = getattr(fig.layout, 'xaxis', None)
-                rangeslider = getattr(xaxis, 'rangeslider', None) if xaxis is not None else None
-                current_visible = bool(getattr(rangeslider, 'visible', False))
-                fig.update_layout(xaxis_rangeslider_visible=not current_visible)
-            except Exception:
-                pass
+            current_visible = self._layout_state.get('xaxis_rangeslider_visible', False)
+            self._patch_layout(get_current_fig(), xaxis_rangeslider_visible=not current_visible)
 
         # 新增：切换标题显示/隐藏
         def on_toggle_title(btn):
-            fig = get_current_fig()
-            if fig is None:
-                return
-            try:
-                # 读取当前 title 文本（若为空或 None 视为隐藏）
-                current_text = getattr(getattr(fig.layout, 'title', None), 'text', None) or ''
-                new_text = self.title if not current_text else ''
-                # 使用 title_text 以兼容性更新
-                fig.update_layout(title_text=new_text)
-            except Exception:
-                pass
+            current_text = self._layout_state.get('title_text', self.title)
+            self._patch_layout(get_current_fig(), title_text=self.title if not current_text else '')
 
         try:
             ui.toolbar_reset.on_click(on_reset)
@@ -282,6 +284,13 @@ class DynamicTrendWidget(VBox):
             # 绑定失败时仍标记为未绑定以便后续重试
             self._toolbar_bound = False
 
+    def _patch_layout(self, fig, **options):
+        """记录工具栏切换的显示选项并应用到当前图表；之后重绘时由渲染器重新应用，保持用户的选择"""
+        self._layout_state.update(options)
+        if fig is None:
+            return
+        self.chart_renderer.apply_view_options(fig, options)
+
     def _set_fig_container(self):
         """设置fig_container的children并触发resize"""
         if hasattr(self, 'ui_components') and self.ui_components.fig_container.children:
@@ -314,116 +323,224 @@ class DynamicTrendWidget(VBox):
             pass
 
     def _refresh_y_axis_table(self):
-        """刷新Y轴参数表格"""
+        """
+        刷新Y轴参数表格。
+        行控件按列名缓存：只为新增的系列创建控件、丢弃已移除系列的行，其余行只同步控件的值，
+        前端不必重建整个表格
+        """
         if not self.state['series']:
-            self.ui_components.y_axis_table.children = [widgets.HTML("<p style='color:gray;'>暂无参数</p>")]
+            self._row_widgets.clear()
+            # 提示文字跨占网格的整行
+            self.ui_components.y_axis_table.children = [
+                widgets.HTML("<p style='color:gray;'>暂无参数</p>", layout=Layout(grid_column='1 / -1'))
+            ]
             return
 
-        table_rows = []
-        total = len(self.state['series'])
-
-        for i, s in enumerate(self.state['series']):
-            # 颜色选择器
-            color_picker = widgets.ColorPicker(
-                concise=True,
-                value=s['color'],
-                layout=Layout(width='40px', margin='0 5px 0 0')
-            )
-            color_picker.observe(lambda c, idx=i: self._on_color_change(c, idx), names='value')
-
-            # 可见性复选框
-            checkbox = widgets.Checkbox(
-                value=s['visible'],
-                indent=False,
-                layout=Layout(width='20px', margin='0 5px 0 0')
-            )
-            checkbox.observe(lambda c, idx=i: self._on_visible_change(c, idx), names='value')
-
-            # 平滑开关
-            smooth_checkbox = widgets.Checkbox(
-                value=s.get('smooth_enabled', False),
-                indent=False,
-                layout=Layout(width='20px', margin='0 5px 0 0')
-            )
-            smooth_checkbox.observe(lambda c, idx=i: self._on_smooth_enabled_change(c, idx), names='value')
-
-            # 平滑窗口输入框
-            smooth_window_input = widgets.IntText(
-                value=s.get('smooth_window', DEFAULT_SMOOTH_WINDOW),
-                min=2,
-                max=100,
-                step=1,
-                layout=Layout(width='50px', margin='0 5px 0 0')
-            )
-            smooth_window_input.observe(lambda c, idx=i: self._on_smooth_window_change(c, idx), names='value')
-
-            # 参数名标签
-            label = widgets.Label(
-                value=s['col'],
-                layout=Layout(width='140px', overflow='hidden')
-            )
-
-            from .utils import create_param_row
-            table_rows.append(create_param_row([checkbox, color_picker, smooth_checkbox, smooth_window_input, label]))
-
-        self.ui_components.y_axis_table.children = table_rows
+        rows = {}
+        for s in self.state['series']:
+            col = s['col']
+            row = self._row_widgets.get(col)
+            if row is None:
+                row = self._create_y_axis_row(s)
+            else:
+                # 值与控件相同时 traitlets 不会发送消息，也不会触发回调
+                row['color'].value = s['color']
+                row['visible_cb'].value = s['visible']
+                row['smooth_cb'].value = s.get('smooth_enabled', False)
+                row['smooth_win'].value = s.get('smooth_window', DEFAULT_SMOOTH_WINDOW)
+            rows[col] = row
+
+        self._row_widgets = rows
+        cells = [row[name] for row in rows.values() for name in self._Y_AXIS_ROW_CELLS]
+        if list(self.ui_components.y_axis_table.children) != cells:
+            self.ui_components.y_axis_table.children = cells
+
+    def _create_y_axis_row(self, s: Dict) -> Dict[str, widgets.Widget]:
+        """创建Y轴参数表格中某个系列的行控件，回调按列名绑定，增删其它行时无需重新绑定"""
+        col = s['col']
+        # 颜色选择器
+        color_picker = widgets.ColorPicker(
+            concise=True,
+            value=s['color'],
+            layout=Layout(width='40px', margin='0 5px 0 0')
+        )
+        color_picker.observe(partial(self._on_color_change, col=col), names='value')
+
+        # 可见性复选框
+        checkbox = widgets.Checkbox(
+            value=s['visible'],
+            indent=False,
+            layout=Layout(width='20px', margin='0 5px 0 0')
+        )
+        checkbox.observe(partial(self._on_visible_change, col=col), names='value')
+
+        # 平滑开关
+        smooth_checkbox = widgets.Checkbox(
+            value=s.get('smooth_enabled', False),
+            indent=False,
+            layout=Layout(width='20px', margin='0 5px 0 0')
+        )
+        smooth_checkbox.observe(partial(self._on_smooth_enabled_change, col=col), names='value')
+
+        # 平滑窗口输入框
+        smooth_window_input = widgets.IntText(
+            value=s.get('smooth_window', DEFAULT_SMOOTH_WINDOW),
+            min=2,
+            max=100,
+            step=1,
+            layout=Layout(width='50px', margin='0 5px 0 0')
+        )
+        smooth_window_input.observe(partial(self._on_smooth_window_change, col=col), names='value')
+
+        # 参数名标签
+        label = widgets.Label(
+            value=col,
+            layout=Layout(width='140px', overflow='hidden')
+        )
+
+        return {
+            'color': color_picker,
+            'visible_cb': checkbox,
+            'smooth_cb': smooth_checkbox,
+            'smooth_win': smooth_window_input,
+            'label': label,
+        }
 
     def _update_figure(self):
         """核心绘图逻辑"""
         if not hasattr(self.ui_components, 'fig_container') or not self.ui_components.fig_container.children:
             return
 
+        key = self._plot_key()
+        if key == self._last_plot_key:
+            return
+        if self._apply_color_changes(self._last_plot_key, key):
+            self._last_plot_key = key
+            return
+
+        data_key = (self.state['resample_rule'], self.x_column, id(self.df), len(self.df))
+        if data_key != self._last_data_key:
+            self.chart_renderer.clear_data_cache()
+            # 只切换重采样规则时保留数据处理缓存（其键中含规则），切换回来无需重新计算
+            if self._last_data_key is None or data_key[1:] != self._last_data_key[1:]:
+                self.data_processor.x_column = self.x_column
+                self.data_processor.clear_cache()
+            self._last_data_key = data_key
+
         fig = self.ui_components.fig_container.children[0]
-        processed_df = self.data_processor.apply_data_processing(self.df, self.state['series'], self.state['resample_rule'])
+        processed_df = self.data_processor.apply_data_processing(self._plot_frame(), self.state['series'], self.state['resample_rule'])
 
         self.chart_renderer.update_figure(
             fig, self.title, processed_df, self.state['series'],
-            self.x_column, self.is_timeseries, self.ui_components.fig_container
+            self.x_column, self.is_timeseries, self.ui_components.fig_container,
+            layout_mode=self.state['layout_mode'], view_options=self._layout_state
+        )
+        self._last_plot_key = key
+
+    def _schedule_update_figure(self):
+        """延迟重绘：连续的界面事件（拖动颜色、快速勾选参数等）合并为一次重绘"""
+        # 新的变化替换令牌，之前排队的回调到期后自动失效
+        token = self._update_token = object()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环（例如在脚本中直接调用）时立即更新
+            self._update_figure()
+            return
+
+        loop.call_later(UPDATE_DEBOUNCE_SECONDS, self._debounced_update_figure, token)
+
+    def _debounced_update_figure(self, token):
+        """延迟重绘回调：只响应最近一次界面事件"""
+        if token is self._update_token:
+            self._update_token = None
+            self._update_figure()
+
+    def _plot_key(self) -> tuple:
+        """由影响绘图结果的各项状态组成的标签（系列元组中第 2 项为颜色）"""
+        series_key = tuple(
+            (s['col'], s['color'], s['visible'], s.get('smooth_enabled', False),
+             s.get('smooth_window'))
+            for s in self.state['series']
+        )
+        return (
+            self.state['layout_mode'], series_key, self.state['resample_rule'],
+            self.x_column, id(self.df), len(self.df), self.chart_renderer.figsize, self.title
         )
 
+    def _apply_color_changes(self, old_key: Optional[tuple], new_key: tuple) -> bool:
+        """两次标签只有颜色不同时，直接修改对应 trace 的颜色，成功返回 True"""
+        if old_key is None or old_key[0] != new_key[0] or old_key[2:] != new_key[2:]:
+            return False
+        old_series, new_series = old_key[1], new_key[1]
+        if len(old_series) != len(new_series):
+            return False
+        changed = []
+        for old, new in zip(old_series, new_series):
+            if old[:1] + old[2:] != new[:1] + new[2:]:
+                return False
+            if old[1] != new[1]:
+                changed.append(new)
+        # 不可见的系列没有对应 trace，只需更新可见系列
+        return all(self._update_trace_color(col, color) for col, color, visible, *_ in changed if visible)
+
+    def _update_trace_color(self, col: str, color: str) -> bool:
+        """只更新图表中某个系列的颜色，成功时返回 True"""
+        container = self.ui_components.fig_container
+        if not container.children:
+            return False
+        return self.chart_renderer.update_trace_color(container.children[0], col, color)
+
     # --- 事件处理 ---
 
     def _on_mode_change(self, change):
         self.state['layout_mode'] = change['new']
-        # 更新所有系列的layout_mode
-        for s in self.state['series']:
-            s['layout_mode'] = change['new']
-        self._update_figure()
+        self._schedule_update_figure()
 
-    def _on_color_change(self, change, index):
-        self.state['series'][index]['color'] = change['new']
-        # 颜色改变不需要重构 Subplots，只需更新 Trace
-        # 但为了简单，MVP 版本直接全量更新，后续可优化
-        self._update_figure()
+    def _on_color_change(self, change, col):
+        s = self._series_by_col.get(col)
+        if s is None:
+            return
+        s['color'] = change['new']
+        # 拖动取色器时合并为一次更新；只有颜色变化时重绘只修改对应 Trace 的线条颜色
+        self._schedule_update_figure()
 
-    def _on_visible_change(self, change, index):
-        self.state['series'][index]['visible'] = change['new']
-        self._update_figure()
+    def _on_visible_change(self, change, col):
+        s = self._series_by_col.get(col)
+        if s is None:
+            return
+        s['visible'] = change['new']
+        self._schedule_update_figure()
 
     def _on_resample_change(self, change):
         """重采样规则变化处理"""
         self.state['resample_rule'] = change['new']
-        self._update_figure()
+        self._schedule_update_figure()
 
-    def _on_smooth_enabled_change(self, change, index):
+    def _on_smooth_enabled_change(self, change, col):
         """平滑开关变化处理"""
-        self.state['series'][index]['smooth_enabled'] = change['new']
-        self._update_figure()
+        s = self._series_by_col.get(col)
+        if s is None:
+            return
+        s['smooth_enabled'] = change['new']
+        self._schedule_update_figure()
 
-    def _on_smooth_window_change(self, change, index):
+    def _on_smooth_window_change(self, change, col):
         """平滑窗口大小变化处理"""
-        self.state['series'][index]['smooth_window'] = change['new']
-        self._update_figure()
+        s = self._series_by_col.get(col)
+        if s is None:
+            return
+        s['smooth_window'] = change['new']
+        self._schedule_update_figure()
 
     def _on_x_axis_change(self, change):
         """X轴参数变化处理"""
         self.x_column = change['new']
         # 数据处理
-        if self.x_column in self.df.columns:
-            self.df[self.x_column] = pd.to_datetime(self.df[self.x_column])
-            self.df = self.df.sort_values(self.x_column)
+        self._ensure_x_prepared(self.x_column)
 
-        self._update_figure()
+        self._schedule_update_figure()
 
     # 参数选择界面相关方法（保留兼容性）
 
@@ -446,12 +563,12 @@ class DynamicTrendWidget(VBox):
         """Y轴参数勾选变化处理"""
         if change['new']:
             # 添加参数
-            if not any(s['col'] == col_name for s in self.state['series']):
+            if col_name not in self._series_by_col:
                 color = self._pending_colors.get(col_name, get_default_color(len(self.state['series'])))
                 pending_s = self._pending_smooth.get(col_name, {})
                 smooth_enabled = pending_s.get('enabled', False)
                 smooth_window = pending_s.get('window', DEFAULT_SMOOTH_WINDOW)
-                self.state['series'].append({
+                self._add_series({
                     'col': col_name,
                     'color': color,
                     'visible': True,
@@ -460,7 +577,7 @@ class DynamicTrendWidget(VBox):
                 })
         else:
             # 移除参数
-            self.state['series'] = [s for s in self.state['series'] if s['col'] != col_name]
+            self._remove_series(col_name)
 
         # 检查是否可以开始绘图
         self._check_and_start_plotting()
@@ -471,20 +588,13 @@ class DynamicTrendWidget(VBox):
             self.y_columns = [s['col'] for s in self.state['series']]
 
             # 数据处理
-            if self.is_timeseries:
-                # 时间序列DataFrame：确保索引是datetime类型并排序
-                if not isinstance(self.df.index, pd.DatetimeIndex):
-                    self.df.index = pd.to_datetime(self.df.index)
-                self.df = self.df.sort_index()
-            elif self.x_column in self.df.columns:
-                self.df[self.x_column] = pd.to_datetime(self.df[self.x_column])
-                self.df = self.df.sort_values(self.x_column)
+            self._ensure_x_prepared(self.x_column)
 
             # 初始化图表
             self._init_figure()
 
             # 仅更新图表区域（保持左侧参数面板不变）
-            self._update_figure()
+            self._schedule_update_figure()
         else:
             # 当没有有效的参数时，清空图表
             if hasattr(self, 'fig') and hasattr(self, 'fig_container'):
@@ -496,11 +606,11 @@ class DynamicTrendWidget(VBox):
         new_color = change['new']
         self._pending_colors[col_name] = new_color
         # 更新现有系列的颜色并刷新图表
-        for s in self.state['series']:
-            if s['col'] == col_name:
-                s['color'] = new_color
-                self._update_figure()
-                break
+        s = self._series_by_col.get(col_name)
+        if s is not None:
+            s['color'] = new_color
+            # 拖动取色器时合并为一次更新；只有颜色变化时重绘只修改对应 Trace 的线条颜色
+            self._schedule_update_figure()
 
     def _on_param_smooth_change(self, change, col_name, kind):
         """参数行中平滑开关或窗口变化处理（用于参数选择界面）"""
@@ -514,16 +624,17 @@ class DynamicTrendWidget(VBox):
                 entry['window'] = entry.get('window', DEFAULT_SMOOTH_WINDOW)
         self._pending_smooth[col_name] = entry
         # 如果该系列已经存在于 state 中，也要同步更新
-        for s in self.state['series']:
-            if s['col'] == col_name:
-                s['smooth_enabled'] = entry['enabled']
-                s['smooth_window'] = entry['window']
-                self._update_figure()
-                break
+        s = self._series_by_col.get(col_name)
+        if s is not None:
+            s['smooth_enabled'] = entry['enabled']
+            s['smooth_window'] = entry['window']
+            self._schedule_update_figure()
 
     def _on_reselect_params(self, button):
         """重新选择参数"""
         self.x_column = None
         self.y_columns = []
         self.state['series'] = []
+        self._series_by_col.clear()
+        self._row_widgets.clear()
         self._show_param_selection()
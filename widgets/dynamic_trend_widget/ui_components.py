@@ -4,10 +4,11 @@ UI组件模块
 
 import pandas as pd
 import ipywidgets as widgets
+from functools import partial
 from ipywidgets import HBox, VBox, Layout, GridBox
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
-from .constants import LAYOUT_MODE_OPTIONS, RESAMPLE_OPTIONS
+from .constants import LAYOUT_MODE_OPTIONS, RESAMPLE_OPTIONS, DEFAULT_SMOOTH_WINDOW
 from .utils import get_default_color, create_dtype_icon, create_param_row
 
 
@@ -18,6 +19,12 @@ class UIComponents:
         self.df = df
         self.x_column = x_column
         self.is_timeseries = is_timeseries
+        # 数值列缓存：首次刷新参数表时计算，列类型变化（X轴列被转换为 datetime）时由主类清空
+        self._numeric_columns: Optional[List[str]] = None
+        # 参数选择表格的行控件池 {列名: (行, 复选框, 颜色选择器, 平滑开关, 平滑窗口)}，刷新时按列复用
+        self._param_rows: Dict[str, Tuple[HBox, widgets.Checkbox, widgets.ColorPicker, widgets.Checkbox, widgets.IntText]] = {}
+        # 复用行时重置控件取值期间为 True，此时不向主类转发事件
+        self._resetting_rows = False
 
         # 初始化组件
         self._init_components()
@@ -59,7 +66,13 @@ class UIComponents:
 
         # Y轴参数表格容器
         self.y_param_table = VBox(layout=Layout(width='280px'))
-        self.y_axis_table = VBox(layout=Layout(width='280px'))
+        # Y轴参数表格：各系列的控件平铺在一个网格中（每行依次为可见、颜色、平滑、窗口、名称），不再逐行包一层 HBox
+        self.y_axis_table = GridBox(layout=Layout(
+            width='280px',
+            grid_template_columns='repeat(4, auto) 1fr',
+            grid_gap='4px 0',
+            align_items='center'
+        ))
 
         # 图表容器（允许在内容超出时滚动）
         self.fig_container = widgets.Box([], layout=Layout(width='100%', height='600px', min_width='0', overflow='auto', border='1px solid #ddd'))
@@ -171,74 +184,111 @@ class UIComponents:
         # 顶部放置自定义工具栏，然后是主布局
         return VBox([self.toolbar, self.main_layout], layout=Layout(width='100%'))
 
+    def get_numeric_columns(self) -> List[str]:
+        """获取数值型列（带缓存）"""
+        if self._numeric_columns is None:
+            self._numeric_columns = self.df.select_dtypes(include=['number']).columns.tolist()
+        return self._numeric_columns
+
+    def invalidate_numeric_columns(self):
+        """列类型发生变化后清空数值列缓存"""
+        self._numeric_columns = None
+
     def _refresh_param_selection_table(self):
         """刷新参数选择表格"""
         # 仅列出数值型列，并排除当前选定的X轴列
-        numeric_columns = self.df.select_dtypes(include=['number']).columns.tolist()
+        numeric_columns = self.get_numeric_columns()
         excluded_x_column = self.x_selector.value if self.x_selector else None
         all_columns = [col for col in numeric_columns if col != excluded_x_column]
+        # dtypes 只取一次，循环中按列名索引，避免逐列 self.df[col] 取出整列
+        dtypes = self.df.dtypes
 
+        rows = {}
         table_rows = []
-        for idx, col in enumerate(all_columns):
-            # 复选框
-            checkbox = widgets.Checkbox(
-                value=False,
-                indent=False,
-                layout=Layout(width='20px', margin='0 5px 0 0')
-            )
-            # Attach parent callback if provided
-            try:
-                checkbox.observe(lambda change, col=col: self.on_y_param_toggle(change, col) if callable(self.on_y_param_toggle) else None, names='value')
-            except Exception:
-                pass
-
-            # 颜色选择器
-            color_picker = widgets.ColorPicker(
-                concise=True,
-                value=get_default_color(idx),
-                layout=Layout(width='40px', margin='0 8px 0 0')
-            )
-            try:
-                color_picker.observe(lambda change, col=col: self.on_param_color_change(change, col) if callable(self.on_param_color_change) else None, names='value')
-            except Exception:
-                pass
-
-            # 平滑开关
-            smooth_checkbox = widgets.Checkbox(
-                value=False,
-                indent=False,
-                layout=Layout(width='20px', margin='0 5px 0 0')
-            )
-            try:
-                smooth_checkbox.observe(lambda change, col=col: self.on_param_smooth_change(change, col, 'enabled') if callable(self.on_param_smooth_change) else None, names='value')
-            except Exception:
-                pass
-
-            # 平滑窗口输入
-            smooth_window_input = widgets.IntText(
-                value=5,
-                min=2,
-                max=100,
-                step=1,
-                layout=Layout(width='50px', margin='0 5px 0 0')
-            )
-            try:
-                smooth_window_input.observe(lambda change, col=col: self.on_param_smooth_change(change, col, 'window') if callable(self.on_param_smooth_change) else None, names='value')
-            except Exception:
-                pass
-
-            # 参数名标签
-            label = widgets.Label(
-                value=col,
-                layout=Layout(width='120px', overflow='hidden')
-            )
+        self._resetting_rows = True
+        try:
+            for idx, col in enumerate(all_columns):
+                row = self._param_rows.get(col)
+                if row is None:
+                    row = self._create_param_selection_row(col, dtypes[col], get_default_color(idx))
+                else:
+                    # 复用已有的行，只把各控件恢复为初始值
+                    _, checkbox, color_picker, smooth_checkbox, smooth_window_input = row
+                    checkbox.value = False
+                    color_picker.value = get_default_color(idx)
+                    smooth_checkbox.value = False
+                    smooth_window_input.value = DEFAULT_SMOOTH_WINDOW
+                rows[col] = row
+                table_rows.append(row[0])
+        finally:
+            self._resetting_rows = False
+
+        # 只保留当前列出的列的行控件
+        self._param_rows = rows
+        self.y_param_table.children = table_rows
+
+    def _create_param_selection_row(self, col: str, dtype, color: str) -> Tuple[HBox, widgets.Checkbox, widgets.ColorPicker, widgets.Checkbox, widgets.IntText]:
+        """创建参数选择表格中某一列的行控件（每列只创建一次，之后刷新时复用）"""
+        # 复选框
+        checkbox = widgets.Checkbox(
+            value=False,
+            indent=False,
+            layout=Layout(width='20px', margin='0 5px 0 0')
+        )
+        checkbox.observe(partial(self._on_row_toggle, col=col), names='value')
 
-            # 数据类型图标
-            type_icon = create_dtype_icon(str(self.df[col].dtype))
+        # 颜色选择器
+        color_picker = widgets.ColorPicker(
+            concise=True,
+            value=color,
+            layout=Layout(width='40px', margin='0 8px 0 0')
+        )
+        color_picker.observe(partial(self._on_row_color_change, col=col), names='value')
 
-            table_rows.append(create_param_row([checkbox, color_picker, smooth_checkbox, smooth_window_input, label, type_icon]))
+        # 平滑开关
+        smooth_checkbox = widgets.Checkbox(
+            value=False,
+            indent=False,
+            layout=Layout(width='20px', margin='0 5px 0 0')
+        )
+        smooth_checkbox.observe(partial(self._on_row_smooth_change, col=col, kind='enabled'), names='value')
+
+        # 平滑窗口输入
+        smooth_window_input = widgets.IntText(
+            value=DEFAULT_SMOOTH_WINDOW,
+            min=2,
+            max=100,
+            step=1,
+            layout=Layout(width='50px', margin='0 5px 0 0')
+        )
+        smooth_window_input.observe(partial(self._on_row_smooth_change, col=col, kind='window'), names='value')
 
-        self.y_param_table.children = table_rows
+        # 参数名标签
+        label = widgets.Label(
+            value=col,
+            layout=Layout(width='120px', overflow='hidden')
+        )
+
+        # 数据类型图标
+        type_icon = create_dtype_icon(dtype)
+
+        row = create_param_row([checkbox, color_picker, smooth_checkbox, smooth_window_input, label, type_icon])
+        return row, checkbox, color_picker, smooth_checkbox, smooth_window_input
+
+    def _on_row_toggle(self, change, col: str):
+        """参数行勾选变化，转发给主类"""
+        if not self._resetting_rows and callable(self.on_y_param_toggle):
+            self.on_y_param_toggle(change, col)
+
+    def _on_row_color_change(self, change, col: str):
+        """参数行颜色变化，转发给主类"""
+        if not self._resetting_rows and callable(self.on_param_color_change):
+            self.on_param_color_change(change, col)
+
+    def _on_row_smooth_change(self, change, col: str, kind: str):
+        """参数行平滑开关或窗口变化，转发给主类"""
+        if not self._resetting_rows and callable(self.on_param_smooth_change):
+            self.on_param_smooth_change(change, col, kind)
 
     def _refresh_y_axis_table(self):
         """刷新Y轴参数表格"""
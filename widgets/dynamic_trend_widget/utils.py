@@ -4,6 +4,8 @@
 
 import pandas as pd
 import ipywidgets as widgets
+from functools import lru_cache
+from pandas.tseries.frequencies import to_offset
 from typing import List, Dict, Optional
 
 from .constants import DEFAULT_COLORS
@@ -24,42 +26,96 @@ def is_timeseries_dataframe(df: pd.DataFrame, x_column: Optional[str] = None) ->
     return False
 
 
+def fast_to_datetime(values):
+    """按源数据类型选择最快的路径转换为 datetime（支持 Series 与 Index）"""
+    # 已经是 datetime（含带时区与 Arrow 时间戳）时无需再解析
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    # 整数：统一转为 int64 走快速路径（uint 等类型在 pandas 中会退化为逐元素处理），单位与默认行为一致
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_datetime(values.astype('int64', copy=False))
+
+    # 字符串：优先按 ISO8601 解析并缓存重复值，非 ISO 格式时退回 pandas 的自动推断
+    if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+        try:
+            return pd.to_datetime(values, format='ISO8601', cache=True)
+        except (ValueError, TypeError):
+            return pd.to_datetime(values, cache=True)
+
+    return pd.to_datetime(values)
+
+
+@lru_cache(maxsize=None)
+def resolve_resample_rule(rule: str):
+    """
+    把重采样规则解析为 pandas 偏移量对象（带缓存）。
+    较新的 pandas 中月末写作 'ME'，旧写法 '1M' 解析失败时改用新写法
+    """
+    try:
+        return to_offset(rule)
+    except ValueError:
+        if rule.endswith('M'):
+            return to_offset(rule + 'E')
+        raise
+
+
 def get_default_color(index: int) -> str:
     """获取默认颜色"""
     return DEFAULT_COLORS[index % len(DEFAULT_COLORS)]
 
 
-def create_dtype_icon(dtype: str) -> widgets.HTML:
-    """创建数据类型图标"""
-    dt_lower = dtype.lower()
-
-    if 'float' in dt_lower or 'int' in dt_lower or 'number' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 14 14" xmlns="http://www.w3.org/2000/svg">'
-                   '<rect x="1" y="8" width="2" height="5" fill="#2b7cff"/>'
-                   '<rect x="5" y="5" width="2" height="8" fill="#2b7cff"/>'
-                   '<rect x="9" y="3" width="2" height="10" fill="#2b7cff"/>'
-                   '</svg>')
-    elif 'datetime' in dt_lower or 'time' in dt_lower or 'date' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<circle cx="12" cy="12" r="10" stroke="#666" stroke-width="1" fill="none"/>'
-                   '<path d="M12 7v6l4 2" stroke="#666" stroke-width="1" fill="none" stroke-linecap="round"/>'
-                   '</svg>')
-    elif 'bool' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<rect x="2" y="6" width="20" height="12" rx="6" fill="#ddd"/>'
-                   '<circle cx="7" cy="12" r="3" fill="#4caf50"/>'
-                   '</svg>')
-    elif 'object' in dt_lower or 'str' in dt_lower or 'string' in dt_lower:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<text x="4" y="16" font-size="12" fill="#444" font-family="Arial, sans-serif">A</text>'
-                   '</svg>')
+# 各数据类型类别对应的 SVG 图标
+_DTYPE_ICON_SVG = {
+    'number': ('<svg width="14" height="14" viewBox="0 0 14 14" xmlns="http://www.w3.org/2000/svg">'
+               '<rect x="1" y="8" width="2" height="5" fill="#2b7cff"/>'
+               '<rect x="5" y="5" width="2" height="8" fill="#2b7cff"/>'
+               '<rect x="9" y="3" width="2" height="10" fill="#2b7cff"/>'
+               '</svg>'),
+    'datetime': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+                 '<circle cx="12" cy="12" r="10" stroke="#666" stroke-width="1" fill="none"/>'
+                 '<path d="M12 7v6l4 2" stroke="#666" stroke-width="1" fill="none" stroke-linecap="round"/>'
+                 '</svg>'),
+    'bool': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+             '<rect x="2" y="6" width="20" height="12" rx="6" fill="#ddd"/>'
+             '<circle cx="7" cy="12" r="3" fill="#4caf50"/>'
+             '</svg>'),
+    'text': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+             '<text x="4" y="16" font-size="12" fill="#444" font-family="Arial, sans-serif">A</text>'
+             '</svg>'),
+    'unknown': ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
+                '<text x="4" y="16" font-size="12" fill="#999" font-family="Arial, sans-serif">?</text>'
+                '</svg>'),
+}
+
+# dtype.kind 到图标类别的映射
+_DTYPE_KIND_CATEGORY = {
+    'f': 'number', 'i': 'number', 'u': 'number', 'c': 'number',
+    'M': 'datetime', 'm': 'datetime',
+    'b': 'bool',
+    'O': 'text', 'U': 'text', 'S': 'text',
+}
+
+
+@lru_cache(maxsize=None)
+def _dtype_icon_html(dtype_name: str, kind: str) -> str:
+    """生成数据类型图标的 HTML（按 dtype 缓存）"""
+    icon_svg = _DTYPE_ICON_SVG[_DTYPE_KIND_CATEGORY.get(kind, 'unknown')]
+    return f'<span title="{dtype_name}" style="line-height:20px;">{icon_svg}</span>'
+
+
+def create_dtype_icon(dtype) -> widgets.HTML:
+    """创建数据类型图标（dtype 可以是 dtype 对象或 dtype 名称字符串）"""
+    if isinstance(dtype, str):
+        try:
+            kind = pd.api.types.pandas_dtype(dtype).kind
+        except TypeError:
+            kind = ''
     else:
-        icon_svg = ('<svg width="14" height="14" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg">'
-                   '<text x="4" y="16" font-size="12" fill="#999" font-family="Arial, sans-serif">?</text>'
-                   '</svg>')
+        kind = dtype.kind
 
     return widgets.HTML(
-        value=f'<span title="{dtype}" style="line-height:20px;">{icon_svg}</span>',
+        value=_dtype_icon_html(str(dtype), kind),
         layout=widgets.Layout(width='36px')
     )
 